@@ -4,50 +4,223 @@ Agent Bootstrap Loader for kOS
 Efficiently loads essential indexes and provides dynamic loading capabilities
 """
 
+import asyncio
+import atexit
 import json
 import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 import logging
 
+# Shared index helpers live next to asset_indexer.py
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from index_format import read_chunk, open_lazy_chunk, decode_chunk, IndexFormatError, BINARY_SUFFIX
+from search_index import (
+    SearchIndex, load_path_index, parse_path_index, record_tags,
+    SEARCH_INDEX_FILE, PATH_INDEX_FILE, DOC_ASSET_TYPE, DOC_CHUNK, DOC_RECORD, DOC_PATH
+)
+from shared_index import SharedIndex, SharedIndexHost
+from bounded_cache import BoundedCache
+from index_client import IndexClient, IndexDaemonError
+
 logger = logging.getLogger(__name__)
 
+USAGE_STATS_FILE = "usage.json"
+
+# Returned by query_daemon when the query has to be answered locally
+NO_DAEMON = object()
+
+class ChunkCache(BoundedCache):
+    """LRU cache of loaded chunks bounded by record count and bytes, invalidated by chunk file mtime"""
+    
+    def __init__(self, max_records: Optional[int] = None, max_bytes: Optional[int] = None):
+        super().__init__(max_records=max_records, max_bytes=max_bytes)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a cached chunk if its source file is unchanged, counting hits and misses"""
+        return super().get(key, self.is_current)
+    
+    def put(self, key: str, chunk_data: Any, source_path: Optional[Path], mtime_ns: int, size_bytes: int) -> None:
+        """Cache a chunk and evict least recently used chunks beyond the bounds"""
+        super().put(key, chunk_data, (source_path, mtime_ns), len(chunk_data.get('files', [])), size_bytes)
+    
+    @staticmethod
+    def is_current(stamp: Tuple[Optional[Path], int]) -> bool:
+        """Whether the chunk file is unchanged since it was cached (not re-indexed or removed)"""
+        source_path, mtime_ns = stamp
+        if source_path is None:
+            # Served from a shared-memory snapshot, which never changes underneath us
+            return True
+        try:
+            return source_path.stat().st_mtime_ns == mtime_ns
+        except OSError:
+            return False
+
 class AgentBootstrap:
-    def __init__(self, project_root: str = "packages/data"):
+    def __init__(self, project_root: str = "packages/data", use_binary: bool = True, lazy: bool = False,
+                 cache_max_records: Optional[int] = None, cache_max_bytes: Optional[int] = 64 * 1024 * 1024,
+                 shared: bool = False, prefetch: bool = False, prefetch_concurrency: int = 4,
+                 prefetch_top_chunks: int = 8, daemon: bool = False):
         self.project_root = Path(project_root)
         self.indexes_path = self.project_root / "indexes"
         self.bootstrap_path = self.indexes_path / "bootstrap.json"
         
-        # Cache for loaded chunks
-        self.chunk_cache = {}
+        # Prefer compact .kidx chunks when the indexer emitted them
+        self.use_binary = use_binary
+        
+        # Memory-map binary chunks and decode file records only when accessed
+        self.lazy = lazy
+        
+        # Cache for loaded chunks; size is accounted by the chunk file it was loaded from
+        self.chunk_cache = ChunkCache(cache_max_records, cache_max_bytes)
         self.bootstrap_data = None
         
+        # mtime of bootstrap.json when it was read (None if served by a daemon or shared memory);
+        # stale is set when a cached chunk turned out re-indexed, so the bootstrap is reloaded too
+        self.bootstrap_mtime = None
+        self.bootstrap_stale = False
+        
+        # Trigram search index; False once it turned out missing or stale
+        self.search_index = None
+        
+        # Path -> (asset_type, chunk, record_index); False once it turned out missing or stale
+        self.path_index = None
+        
+        # Attach to an index host's shared-memory segment when one is running
+        self.shared = shared
+        self.shared_index: Optional[SharedIndex] = None
+        
+        # Forward queries to a running index daemon (index_daemon.py) when one is serving these indexes
+        self.daemon = daemon
+        self.daemon_client: Optional[IndexClient] = None
+        
+        # Background prefetch of critical and frequently used chunks after load_bootstrap
+        self.prefetch = prefetch
+        self.prefetch_concurrency = prefetch_concurrency
+        self.prefetch_top_chunks = prefetch_top_chunks
+        self.prefetch_future: Optional[Future] = None
+        
+        # Prefetch threads share the cache; in-flight maps chunk key -> future of its chunk data
+        self.cache_lock = threading.Lock()
+        self.inflight: Dict[str, Future] = {}
+        
+        # Chunk loads in this process, merged into indexes/usage.json by save_usage_stats on
+        # close(), and at exit when prefetching so the next startup prefetches the hot chunks
+        self.chunk_usage = Counter()
+        if prefetch:
+            atexit.register(self.save_usage_stats)
+        
         # Ensure we're in the right directory
         if not self.bootstrap_path.exists():
             # Try relative to current working directory
             self.bootstrap_path = Path("indexes/bootstrap.json")
         
+    def attach_shared_index(self) -> Optional[SharedIndex]:
+        """Attach to the shared-memory index published by an index host, once"""
+        if self.shared and self.shared_index is None:
+            try:
+                self.shared_index = SharedIndex.attach(self.indexes_path)
+            except Exception as e:
+                logger.warning(f"Failed to attach shared index: {e}")
+            if self.shared_index:
+                logger.info(f"🔗 Attached shared index for {self.indexes_path}")
+            else:
+                logger.debug("No shared index host running, reading index files from disk")
+                self.shared = False
+        return self.shared_index
+    
+    def connect_daemon(self) -> Optional[IndexClient]:
+        """Connect to the index daemon serving these indexes, once"""
+        if self.daemon and self.daemon_client is None:
+            try:
+                self.daemon_client = IndexClient.connect(self.indexes_path)
+            except OSError as e:
+                logger.warning(f"Failed to connect to index daemon: {e}")
+            if self.daemon_client:
+                logger.info(f"🔌 Connected to index daemon for {self.indexes_path}")
+            else:
+                logger.debug("No index daemon running, answering queries locally")
+                self.daemon = False
+        return self.daemon_client
+    
+    def query_daemon(self, method: str, **params) -> Any:
+        """Answer a query through the index daemon, or return NO_DAEMON to answer it locally"""
+        client = self.connect_daemon()
+        if client is None:
+            return NO_DAEMON
+        try:
+            return client.call(method, **params)
+        except IndexDaemonError as e:
+            # The daemon went away; keep working from the index files
+            logger.warning(f"Index daemon query {method} failed, answering locally: {e}")
+            client.close()
+            self.daemon_client = None
+            self.daemon = False
+            return NO_DAEMON
+    
     def load_bootstrap(self) -> Dict[str, Any]:
         """Load the bootstrap index (essential for agent startup)"""
+        self.bootstrap_stale = False
+        bootstrap_data = self.query_daemon("load_bootstrap")
+        if bootstrap_data is not NO_DAEMON:
+            self.bootstrap_data = bootstrap_data
+            self.bootstrap_mtime = None
+            return self.bootstrap_data
+        
+        shared_index = self.attach_shared_index()
+        if shared_index and "bootstrap.json" in shared_index:
+            self.bootstrap_data = json.loads(shared_index.get("bootstrap.json").tobytes())
+            self.bootstrap_mtime = None
+            self.search_index = None
+            self.path_index = None
+            if self.prefetch:
+                self.start_prefetch()
+            return self.bootstrap_data
+        
         if not self.bootstrap_path.exists():
             logger.warning("Bootstrap index not found. Run asset_indexer.py first.")
             return {}
         
         try:
+            # Stat before reading, so a re-index during the read triggers another reload
+            bootstrap_mtime = self.bootstrap_path.stat().st_mtime_ns
             with open(self.bootstrap_path, 'r') as f:
                 self.bootstrap_data = json.load(f)
+            self.bootstrap_mtime = bootstrap_mtime
+            self.search_index = None
+            self.path_index = None
             
             logger.info(f"✅ Bootstrap loaded: {self.bootstrap_data['system']['totalAssets']} total assets")
+            if self.prefetch:
+                self.start_prefetch()
             return self.bootstrap_data
             
         except Exception as e:
             logger.error(f"Failed to load bootstrap: {e}")
             return {}
     
-    def get_critical_assets(self, asset_type: str = None) -> List[Dict[str, Any]]:
-        """Get critical assets for immediate use"""
+    def ensure_bootstrap(self) -> None:
+        """Load the bootstrap, or reload it when the index was rewritten since it was read"""
         if not self.bootstrap_data:
             self.load_bootstrap()
+            return
+        
+        if self.bootstrap_mtime is not None and not self.bootstrap_stale:
+            stat = self.stat_or_none(self.bootstrap_path)
+            self.bootstrap_stale = stat is not None and stat.st_mtime_ns != self.bootstrap_mtime
+        if self.bootstrap_stale:
+            # load_bootstrap also drops the search and path tables built for the old index
+            logger.info("🔄 Index changed on disk, reloading bootstrap")
+            self.load_bootstrap()
+    
+    def get_critical_assets(self, asset_type: str = None) -> List[Dict[str, Any]]:
+        """Get critical assets for immediate use"""
+        self.ensure_bootstrap()
         
         critical = self.bootstrap_data.get('critical', {})
         
@@ -62,25 +235,71 @@ class AgentBootstrap:
         return all_critical
     
     def load_chunk(self, asset_type: str, chunk_name: str) -> Optional[Dict[str, Any]]:
-        """Dynamically load a specific chunk"""
+        """Dynamically load a specific chunk (a lazily decoded mapping in lazy mode)"""
+        chunk_data = self.query_daemon("load_chunk", asset_type=asset_type, chunk_name=chunk_name)
+        if chunk_data is not NO_DAEMON:
+            return chunk_data
+        
         cache_key = f"{asset_type}/{chunk_name}"
+        self.chunk_usage[cache_key] += 1
         
         # Check cache first
-        if cache_key in self.chunk_cache:
-            return self.chunk_cache[cache_key]
+        with self.cache_lock:
+            invalidations = self.chunk_cache.invalidations
+            chunk_data = self.chunk_cache.get(cache_key)
+            pending = self.inflight.get(cache_key)
+            reindexed = self.chunk_cache.invalidations != invalidations
+        if chunk_data is not None:
+            return chunk_data
+        
+        if reindexed and self.bootstrap_mtime is not None:
+            # The chunk was re-indexed, so the bootstrap and the tables pointing into chunks are
+            # from an older generation; drop the tables now and reload the bootstrap on next use
+            self.search_index = None
+            self.path_index = None
+            self.bootstrap_stale = True
+        
+        # A prefetch is already reading this chunk; wait for it instead of reading it again
+        if pending is not None:
+            chunk_data = pending.result()
+            if chunk_data is not None:
+                return chunk_data
+        
+        return self.fetch_chunk(asset_type, chunk_name)
+    
+    def fetch_chunk(self, asset_type: str, chunk_name: str) -> Optional[Dict[str, Any]]:
+        """Read a chunk from the shared index or disk, bypassing the cache lookup, and cache it"""
+        cache_key = f"{asset_type}/{chunk_name}"
+        chunk_data = None
+        
+        if self.shared_index:
+            return self.load_shared_chunk(asset_type, chunk_name)
         
         chunk_path = self.indexes_path / asset_type / f"{chunk_name}.json"
+        binary_chunk_path = self.indexes_path / asset_type / f"{chunk_name}{BINARY_SUFFIX}"
+        json_stat = self.stat_or_none(chunk_path)
         
-        if not chunk_path.exists():
+        # Stat before reading so a concurrent re-index invalidates the cached copy
+        if self.use_binary:
+            binary_stat = self.stat_or_none(binary_chunk_path)
+            # A JSON chunk rewritten after the binary one means the binary is stale
+            if binary_stat and (json_stat is None or json_stat.st_mtime_ns <= binary_stat.st_mtime_ns):
+                chunk_data = self.load_binary_chunk(asset_type, chunk_name, binary_chunk_path)
+                source_path, source_stat = binary_chunk_path, binary_stat
+        
+        if chunk_data is None and json_stat is None:
             logger.warning(f"Chunk not found: {chunk_path}")
             return None
         
         try:
-            with open(chunk_path, 'r') as f:
-                chunk_data = json.load(f)
+            if chunk_data is None:
+                with open(chunk_path, 'r') as f:
+                    chunk_data = json.load(f)
+                source_path, source_stat = chunk_path, json_stat
             
             # Cache the chunk
-            self.chunk_cache[cache_key] = chunk_data
+            with self.cache_lock:
+                self.chunk_cache.put(cache_key, chunk_data, source_path, source_stat.st_mtime_ns, source_stat.st_size)
             
             logger.info(f"📦 Loaded chunk: {asset_type}/{chunk_name} ({len(chunk_data['files'])} files)")
             return chunk_data
@@ -89,10 +308,206 @@ class AgentBootstrap:
             logger.error(f"Failed to load chunk {chunk_path}: {e}")
             return None
     
+    def load_shared_chunk(self, asset_type: str, chunk_name: str) -> Optional[Dict[str, Any]]:
+        """Load a chunk from the shared-memory index, decoding records in place when possible"""
+        cache_key = f"{asset_type}/{chunk_name}"
+        binary_view = self.shared_index.get(f"{cache_key}{BINARY_SUFFIX}")
+        try:
+            if binary_view is not None:
+                chunk_data = decode_chunk(binary_view, lazy=True)
+                size = len(binary_view)
+            else:
+                json_view = self.shared_index.get(f"{cache_key}.json")
+                if json_view is None:
+                    logger.warning(f"Chunk not found in shared index: {cache_key}")
+                    return None
+                chunk_data = json.loads(json_view.tobytes())
+                size = len(json_view)
+        except Exception as e:
+            logger.error(f"Failed to load shared chunk {cache_key}: {e}")
+            return None
+        
+        with self.cache_lock:
+            self.chunk_cache.put(cache_key, chunk_data, None, 0, size)
+        return chunk_data
+    
+    def stat_or_none(self, path: Path) -> Optional[os.stat_result]:
+        try:
+            return path.stat()
+        except FileNotFoundError:
+            return None
+    
+    def load_binary_chunk(self, asset_type: str, chunk_name: str, binary_chunk_path: Path) -> Optional[Dict[str, Any]]:
+        """Load the binary twin of a chunk, or None to fall back to JSON"""
+        try:
+            if self.lazy:
+                try:
+                    return open_lazy_chunk(binary_chunk_path)
+                except IndexFormatError as e:
+                    # Chunks written without a record table can still be loaded whole
+                    logger.debug(f"Lazy load unavailable for {asset_type}/{chunk_name}: {e}")
+            return read_chunk(binary_chunk_path)
+        except FileNotFoundError:
+            return None
+        except (IndexFormatError, OSError, ValueError, EOFError, TypeError) as e:
+            logger.debug(f"Falling back to JSON for {asset_type}/{chunk_name}: {e}")
+            return None
+    
+    def get_prefetch_keys(self) -> List[Tuple[str, str]]:
+        """Chunks holding critical assets, then the most used chunks recorded in usage.json"""
+        indexes = self.bootstrap_data.get('indexes', {})
+        type_by_critical_key = {f"core{asset_type.capitalize()}": asset_type for asset_type in indexes}
+        
+        keys = []
+        for critical_key, assets in self.bootstrap_data.get('critical', {}).items():
+            asset_type = type_by_critical_key.get(critical_key)
+            if asset_type is None:
+                continue
+            for asset in assets:
+                # Chunks are named after the category they group, as in asset_indexer.py
+                category = str(asset.get('category', 'general'))
+                keys.append((asset_type, category.lower().replace(' ', '_')))
+        
+        for cache_key, _count in self.load_usage_stats().most_common(self.prefetch_top_chunks):
+            asset_type, _, chunk_name = cache_key.partition('/')
+            keys.append((asset_type, chunk_name))
+        
+        # Drop duplicates and chunks the bootstrap no longer lists
+        return [
+            (asset_type, chunk_name) for asset_type, chunk_name in dict.fromkeys(keys)
+            if chunk_name in indexes.get(asset_type, {}).get('chunks', [])
+        ]
+    
+    def start_prefetch(self, chunk_keys: Iterable[Tuple[str, str]] = None) -> Future:
+        """Prefetch chunks on a background event loop; the future yields the number of chunks read"""
+        if chunk_keys is None:
+            chunk_keys = self.get_prefetch_keys()
+        # Register before the thread starts so load_chunk waits on these instead of reading them again
+        pending = self.register_prefetch(chunk_keys)
+        
+        future = Future()
+        def run():
+            try:
+                future.set_result(asyncio.run(self.run_prefetch(pending)))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=run, name="kos-chunk-prefetch", daemon=True).start()
+        self.prefetch_future = future
+        return future
+    
+    async def prefetch_chunks(self, chunk_keys: Iterable[Tuple[str, str]] = None) -> int:
+        """Prefetch chunks from an agent's own event loop, returning the number of chunks read"""
+        if chunk_keys is None:
+            chunk_keys = self.get_prefetch_keys()
+        return await self.run_prefetch(self.register_prefetch(chunk_keys))
+    
+    def register_prefetch(self, chunk_keys: Iterable[Tuple[str, str]]) -> List[Tuple[str, str, Future]]:
+        """Mark chunks that are neither cached nor already being read as in flight"""
+        pending = []
+        with self.cache_lock:
+            for asset_type, chunk_name in chunk_keys:
+                cache_key = f"{asset_type}/{chunk_name}"
+                if cache_key in self.chunk_cache or cache_key in self.inflight:
+                    continue
+                future = Future()
+                self.inflight[cache_key] = future
+                pending.append((asset_type, chunk_name, future))
+        return pending
+    
+    async def run_prefetch(self, pending: List[Tuple[str, str, Future]]) -> int:
+        """Read registered chunks in worker threads, at most prefetch_concurrency at a time"""
+        semaphore = asyncio.Semaphore(max(1, self.prefetch_concurrency))
+        
+        async def fetch(asset_type: str, chunk_name: str, future: Future) -> bool:
+            cache_key = f"{asset_type}/{chunk_name}"
+            chunk_data = None
+            try:
+                async with semaphore:
+                    chunk_data = await asyncio.to_thread(self.fetch_chunk, asset_type, chunk_name)
+            except Exception as e:
+                logger.warning(f"Prefetch failed for {cache_key}: {e}")
+            finally:
+                # Always release waiters, even when cancelled; they fall back to reading the chunk
+                with self.cache_lock:
+                    self.inflight.pop(cache_key, None)
+                future.set_result(chunk_data)
+            return chunk_data is not None
+        
+        results = await asyncio.gather(*(fetch(*entry) for entry in pending))
+        logger.info(f"⚡ Prefetched {sum(results)} chunks")
+        return sum(results)
+    
+    def load_usage_stats(self) -> Counter:
+        """Chunk load counts persisted by save_usage_stats"""
+        usage_path = self.indexes_path / USAGE_STATS_FILE
+        try:
+            with open(usage_path, 'r') as f:
+                return Counter(json.load(f).get('chunks', {}))
+        except FileNotFoundError:
+            return Counter()
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable usage stats {usage_path}: {e}")
+            return Counter()
+    
+    def save_usage_stats(self) -> None:
+        """Merge this process's chunk load counts into indexes/usage.json for future prefetches"""
+        if not self.chunk_usage:
+            return
+        
+        usage = self.load_usage_stats()
+        usage.update(self.chunk_usage)
+        usage_path = self.indexes_path / USAGE_STATS_FILE
+        tmp_path = usage_path.with_name(f"{usage_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({"chunks": dict(usage.most_common())}, f, indent=2)
+            os.replace(tmp_path, usage_path)
+            self.chunk_usage.clear()
+        except OSError as e:
+            logger.warning(f"Failed to save usage stats {usage_path}: {e}")
+    
+    def get_search_index(self) -> Optional[SearchIndex]:
+        """Load the search index if it matches the loaded bootstrap, else None"""
+        if self.search_index is None:
+            self.search_index = False
+            search_index_path = self.indexes_path / SEARCH_INDEX_FILE
+            try:
+                if self.shared_index and SEARCH_INDEX_FILE in self.shared_index:
+                    index = SearchIndex.from_buffer(self.shared_index.get(SEARCH_INDEX_FILE))
+                else:
+                    index = SearchIndex.load(search_index_path)
+                if index.generation == self.bootstrap_data.get('lastUpdated'):
+                    self.search_index = index
+                else:
+                    logger.info("Search index is out of date, falling back to chunk scans")
+            except FileNotFoundError:
+                logger.debug(f"Search index not found: {search_index_path}")
+            except Exception as e:
+                logger.warning(f"Failed to load search index {search_index_path}: {e}")
+        
+        return self.search_index or None
+    
     def search_assets(self, query: str, asset_types: List[str] = None, categories: List[str] = None) -> List[Dict]:
         """Search for assets across all indexed files"""
-        if not self.bootstrap_data:
-            self.load_bootstrap()
+        results = self.query_daemon("search_assets", query=query, asset_types=asset_types, categories=categories)
+        if results is not NO_DAEMON:
+            return results
+        
+        self.ensure_bootstrap()
+        
+        search_index = self.get_search_index() if self.bootstrap_data else None
+        if search_index:
+            if asset_types is None:
+                asset_types = list(self.bootstrap_data.get('indexes', {}).keys())
+            
+            results = [self.get_doc_asset(doc) for doc in search_index.search(query, asset_types, categories)]
+            if None not in results:
+                return results
+            
+            # A document no longer matches its record: the index is stale, so stop trusting it
+            logger.info("Search index is out of date, falling back to chunk scans")
+            self.search_index = False
         
         if asset_types is None:
             asset_types = list(self.bootstrap_data.get('indexes', {}).keys())
@@ -123,6 +538,99 @@ class AgentBootstrap:
         
         return results
     
+    def get_record(self, asset_type: str, chunk_name: str, record_index: int,
+                   asset_path: str = None) -> Optional[Dict[str, Any]]:
+        """Decode a single file record of a chunk, tagged with its chunk and asset type
+        
+        Returns None if the record no longer exists or, when asset_path is given, is another file,
+        i.e. the chunk was rewritten after the table pointing at it was built.
+        """
+        chunk_data = self.load_chunk(asset_type, chunk_name)
+        if not chunk_data:
+            return None
+        files = chunk_data['files']
+        if not 0 <= record_index < len(files):
+            return None
+        file_data = files[record_index]
+        if asset_path is not None and file_data.get('path') != asset_path:
+            return None
+        return {
+            **file_data,
+            "chunk": chunk_name,
+            "asset_type": asset_type
+        }
+    
+    def get_doc_asset(self, doc: tuple) -> Optional[Dict[str, Any]]:
+        """Decode the file record a search index document points at
+        
+        Returns None if the record is gone or is another file, i.e. the chunk was rewritten
+        after the index was built (documents keep the path lowercased).
+        """
+        asset = self.get_record(doc[DOC_ASSET_TYPE], doc[DOC_CHUNK], doc[DOC_RECORD])
+        if asset is None:
+            return None
+        path = asset.get('path')
+        if (path.lower() if isinstance(path, str) else "") != doc[DOC_PATH]:
+            return None
+        return asset
+    
+    def search_ranked(self, query: str, asset_types: List[str] = None, categories: List[str] = None,
+                      limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        """Search for assets ranked by BM25 relevance, returning one page of the best matches"""
+        page = self.query_daemon("search_ranked", query=query, asset_types=asset_types, categories=categories,
+                                 limit=limit, offset=offset)
+        if page is not NO_DAEMON:
+            return page
+        
+        self.ensure_bootstrap()
+        
+        if not self.bootstrap_data:
+            return {"query": query, "total": 0, "offset": offset, "limit": limit, "results": []}
+        
+        if asset_types is None:
+            asset_types = list(self.bootstrap_data.get('indexes', {}).keys())
+        
+        assets = None
+        search_index = self.get_search_index()
+        if search_index:
+            total, page = search_index.rank(query, asset_types, categories, limit, offset)
+            assets = [self.get_doc_asset(doc) for _, doc in page]
+            if None in assets:
+                # A document no longer matches its record: the index is stale, so stop trusting it
+                logger.info("Search index is out of date, ranking against the chunks")
+                self.search_index = False
+                assets = None
+        
+        if assets is None:
+            # Rank against an index built in memory from the chunks
+            total, page = self.build_search_index().rank(query, asset_types, categories, limit, offset)
+            assets = [self.get_doc_asset(doc) for _, doc in page]
+        
+        # Records rewritten while the in-memory index was built are dropped
+        results = [{**asset, "score": score} for (score, _), asset in zip(page, assets) if asset is not None]
+        
+        return {
+            "query": query,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "results": results
+        }
+    
+    def build_search_index(self) -> SearchIndex:
+        """Build a search index in memory from the chunks listed in the bootstrap"""
+        def records():
+            for asset_type, type_info in self.bootstrap_data.get('indexes', {}).items():
+                for chunk_name in type_info.get('chunks', []):
+                    chunk_data = self.load_chunk(asset_type, chunk_name)
+                    if not chunk_data:
+                        continue
+                    for record_index, file_data in enumerate(chunk_data.get('files', [])):
+                        yield asset_type, chunk_name, chunk_data.get('category'), record_index, file_data
+        
+        self.search_index = SearchIndex.build(records(), self.bootstrap_data.get('lastUpdated', ''))
+        return self.search_index
+    
     def matches_search_query(self, file_data: Dict, query: str) -> bool:
         """Check if file data matches search query"""
         query_lower = query.lower()
@@ -146,10 +654,47 @@ class AgentBootstrap:
         
         return False
     
+    def get_path_index(self) -> Optional[Dict[str, tuple]]:
+        """Load the path lookup table if it matches the loaded bootstrap, else None"""
+        if self.path_index is None:
+            self.path_index = False
+            path_index_path = self.indexes_path / PATH_INDEX_FILE
+            try:
+                if self.shared_index and PATH_INDEX_FILE in self.shared_index:
+                    generation, paths = parse_path_index(self.shared_index.get(PATH_INDEX_FILE))
+                else:
+                    generation, paths = load_path_index(path_index_path)
+                if generation == self.bootstrap_data.get('lastUpdated'):
+                    self.path_index = paths
+                else:
+                    logger.info("Path index is out of date, falling back to chunk scans")
+            except FileNotFoundError:
+                logger.debug(f"Path index not found: {path_index_path}")
+            except Exception as e:
+                logger.warning(f"Failed to load path index {path_index_path}: {e}")
+        
+        return self.path_index if self.path_index is not False else None
+    
     def get_asset_by_path(self, asset_path: str) -> Optional[Dict[str, Any]]:
         """Get asset metadata by file path"""
-        if not self.bootstrap_data:
-            self.load_bootstrap()
+        asset = self.query_daemon("get_asset_by_path", asset_path=asset_path)
+        if asset is not NO_DAEMON:
+            return asset
+        
+        self.ensure_bootstrap()
+        
+        path_index = self.get_path_index() if self.bootstrap_data else None
+        if path_index is not None:
+            location = path_index.get(asset_path)
+            if location is None:
+                return None
+            asset = self.get_record(*location, asset_path=asset_path)
+            if asset is not None:
+                return asset
+            
+            # The record moved or is gone: the table is stale, so stop trusting it
+            logger.info("Path index is out of date, falling back to chunk scans")
+            self.path_index = False
         
         # Search through all chunks
         for asset_type, type_info in self.bootstrap_data.get('indexes', {}).items():
@@ -168,13 +713,27 @@ class AgentBootstrap:
         
         return None
     
-    def get_assets_by_type(self, asset_type: str, category: str = None) -> List[Dict]:
-        """Get all assets of a specific type and optionally category"""
-        if not self.bootstrap_data:
-            self.load_bootstrap()
+    def get_assets_by_type(self, asset_type: str, category: str = None, tags: List[str] = None) -> List[Dict]:
+        """Get all assets of a specific type, optionally only one category and/or assets with any of the tags"""
+        assets = self.query_daemon("get_assets_by_type", asset_type=asset_type, category=category, tags=tags)
+        if assets is not NO_DAEMON:
+            return assets
+        
+        self.ensure_bootstrap()
         
         type_info = self.bootstrap_data.get('indexes', {}).get(asset_type, {})
         chunks = type_info.get('chunks', [])
+        wanted_tags = {tag.lower() for tag in tags} if tags else None
+        
+        # Narrow to the relevant chunks when the bootstrap carries the category and tag maps
+        if category and 'categories' in type_info:
+            chunk_name = type_info['categories'].get(category)
+            chunks = [chunk_name] if chunk_name in chunks else []
+        if wanted_tags and 'tagChunks' in type_info:
+            tagged = set()
+            for tag in wanted_tags:
+                tagged.update(type_info['tagChunks'].get(tag, []))
+            chunks = [chunk_name for chunk_name in chunks if chunk_name in tagged]
         
         all_assets = []
         
@@ -188,6 +747,8 @@ class AgentBootstrap:
                 continue
             
             for file_data in chunk_data.get('files', []):
+                if wanted_tags and wanted_tags.isdisjoint(record_tags(file_data)):
+                    continue
                 all_assets.append({
                     **file_data,
                     "chunk": chunk_name,
@@ -196,29 +757,68 @@ class AgentBootstrap:
         
         return all_assets
     
+    def get_chunk_summaries(self, asset_type: str) -> Dict[str, Dict[str, Any]]:
+        """Per-chunk category, record count and tag histogram from the bootstrap, without loading chunks"""
+        self.ensure_bootstrap()
+        
+        return self.bootstrap_data.get('indexes', {}).get(asset_type, {}).get('chunkSummaries', {})
+    
     def get_system_info(self) -> Dict[str, Any]:
         """Get system information from bootstrap"""
-        if not self.bootstrap_data:
-            self.load_bootstrap()
+        self.ensure_bootstrap()
         
         if not self.bootstrap_data:
             return {}
         
         return self.bootstrap_data.get('system', {})
     
-    def clear_cache(self):
-        """Clear the chunk cache"""
-        self.chunk_cache.clear()
-        logger.info("🗑️ Chunk cache cleared")
+    def clear_cache(self, asset_type: str = None, chunk_name: str = None):
+        """Clear the chunk cache, or only the chunks of one asset type / one chunk"""
+        if asset_type is None:
+            self.chunk_cache.clear()
+            logger.info("🗑️ Chunk cache cleared")
+            return
+        
+        prefix = f"{asset_type}/"
+        for cache_key in self.chunk_cache.keys():
+            if cache_key == f"{prefix}{chunk_name}" or (chunk_name is None and cache_key.startswith(prefix)):
+                self.chunk_cache.remove(cache_key)
+        logger.info(f"🗑️ Chunk cache cleared for {asset_type}/{chunk_name or '*'}")
+    
+    def close(self) -> None:
+        """Save chunk usage, drop cached chunks and tables, unmap the shared index and disconnect from the daemon"""
+        self.save_usage_stats()
+        with self.cache_lock:
+            self.chunk_cache.clear()
+        self.search_index = None
+        self.path_index = None
+        
+        # Cached chunks and tables are gone, so no view into the segment is left to keep it mapped
+        if self.shared_index is not None:
+            self.shared_index.close()
+            self.shared_index = None
+            self.shared = False
+        if self.daemon_client is not None:
+            self.daemon_client.close()
+            self.daemon_client = None
+            self.daemon = False
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
+        cache = self.chunk_cache
+        lookups = cache.hits + cache.misses
         return {
-            "cached_chunks": len(self.chunk_cache),
-            "cache_keys": list(self.chunk_cache.keys()),
-            "total_assets_in_cache": sum(
-                len(chunk.get('files', [])) for chunk in self.chunk_cache.values()
-            )
+            "cached_chunks": len(cache),
+            "cache_keys": cache.keys(),
+            "total_assets_in_cache": cache.total_records,
+            "cached_bytes": cache.total_bytes,
+            "max_records": cache.max_records,
+            "max_bytes": cache.max_bytes,
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "evictions": cache.evictions,
+            "invalidations": cache.invalidations,
+            "hit_rate": cache.hits / lookups if lookups else 0.0
         }
 
 def main():
@@ -227,24 +827,42 @@ def main():
     
     parser = argparse.ArgumentParser(description="Agent Bootstrap Loader for kOS")
     parser.add_argument("--search", type=str, help="Search for assets")
+    parser.add_argument("--ranked", action="store_true", help="Rank search results by relevance")
+    parser.add_argument("--limit", type=int, default=10, help="Results per page for ranked search")
+    parser.add_argument("--offset", type=int, default=0, help="Result offset for ranked search")
     parser.add_argument("--type", type=str, help="Asset type to list")
     parser.add_argument("--category", type=str, help="Category to filter by")
+    parser.add_argument("--tags", nargs="+", help="Only list assets with any of these tags")
     parser.add_argument("--path", type=str, help="Get asset by path")
     parser.add_argument("--critical", action="store_true", help="Show critical assets")
     parser.add_argument("--stats", action="store_true", help="Show system stats")
+    parser.add_argument("--host-index", action="store_true",
+                        help="Serve the index to other agent processes from shared memory")
+    parser.add_argument("--shared", action="store_true", help="Attach to a running index host")
+    parser.add_argument("--daemon", action="store_true", help="Query a running index daemon")
     
     args = parser.parse_args()
     
-    bootstrap = AgentBootstrap()
+    bootstrap = AgentBootstrap(shared=args.shared, daemon=args.daemon)
+    
+    if args.host_index:
+        logging.basicConfig(level=logging.INFO)
+        SharedIndexHost(bootstrap.indexes_path).serve_forever()
     
-    if args.search:
+    elif args.search and args.ranked:
+        page = bootstrap.search_ranked(args.search, limit=args.limit, offset=args.offset)
+        print(f"Showing {len(page['results'])} of {page['total']} results:")
+        for result in page['results']:
+            print(f"  {result['score']:.3f}  {result['name']} ({result['asset_type']}/{result['chunk']})")
+    
+    elif args.search:
         results = bootstrap.search_assets(args.search)
         print(f"Found {len(results)} results:")
         for result in results:
             print(f"  {result['name']} ({result['asset_type']}/{result['chunk']})")
     
     elif args.type:
-        assets = bootstrap.get_assets_by_type(args.type, args.category)
+        assets = bootstrap.get_assets_by_type(args.type, args.category, args.tags)
         print(f"Found {len(assets)} {args.type} assets:")
         for asset in assets:
             print(f"  {asset['name']} ({asset['category']})")
@@ -282,6 +900,8 @@ def main():
             print("Bootstrap loaded successfully!")
             print(f"Total assets: {bootstrap_data['system']['totalAssets']}")
             print(f"Indexes: {list(bootstrap_data.get('indexes', {}).keys())}")
+    
+    bootstrap.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
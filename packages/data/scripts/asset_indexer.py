@@ -1,21 +1,68 @@
 import json
 import os
+import mmap
 import yaml
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Union
+from contextlib import contextmanager
 from datetime import datetime
 import hashlib
 import re
+from collections import Counter
+from worker_pool import WorkerPool
+from index_format import write_chunk, BINARY_SUFFIX
+from search_index import write_search_index, write_path_index, record_tags, SEARCH_INDEX_FILE, PATH_INDEX_FILE
 
 logger = logging.getLogger(__name__)
 
+# Bump when the extracted metadata layout changes to invalidate old manifests
+MANIFEST_VERSION = 1
+
+# Files at least this large are memory-mapped instead of read into a buffer
+MMAP_THRESHOLD = 1024 * 1024
+
+# Number of leading lines scanned for code file descriptions
+CODE_HEADER_LINES = 20
+
+# Per-process indexer used by extraction workers
+_worker_indexer = None
+
+def _init_extraction_worker(project_root: str, asset_configs: Dict[str, Dict]) -> None:
+    """Set up the indexer used by a metadata extraction worker process"""
+    global _worker_indexer
+    _worker_indexer = AssetIndexer(project_root)
+    _worker_indexer.asset_configs = asset_configs
+
+def _extract_in_worker(file_path: Path) -> Optional[Dict[str, Any]]:
+    """Extract file metadata inside a worker process"""
+    return _worker_indexer.extract_file_metadata(file_path)
+
 class AssetIndexer:
-    def __init__(self, project_root: str = "packages/data"):
+    def __init__(self, project_root: str = "packages/data", jobs: int = 1, binary: Optional[bool] = None,
+                 record_table: Optional[bool] = None):
         self.project_root = Path(project_root)
         self.indexes_path = self.project_root / "indexes"
         self.indexes_path.mkdir(parents=True, exist_ok=True)
         
+        # Number of worker processes for metadata extraction (1 = serial)
+        self.jobs = max(1, jobs)
+        
+        # Chunk format overrides; None keeps the format the manifest records from the previous run,
+        # so incremental updates (watcher, hook, daemon) don't drop the .kidx twins
+        self._binary = binary
+        self._record_table = record_table
+        
+        # Manifest of path -> (size, mtime_ns, hash, metadata) from the last run
+        self.manifest_path = self.indexes_path / "manifest.json"
+        self._manifest = None
+        
+        # Set when an entry changed, so a no-op run doesn't rewrite the manifest
+        self.manifest_changed = False
+        
+        # In-memory category -> file metadata results per asset type, reused for bootstrap.json
+        self.type_results: Dict[str, Dict[str, List[Dict]]] = {}
+        
         # Asset type configurations
         self.asset_configs = {
             "skills": {
@@ -66,11 +113,15 @@ class AssetIndexer:
             file_type = self.determine_file_type(file_path)
             category = self.determine_category(file_path)
             
-            # Extract content-based metadata
-            content_metadata = self.extract_content_metadata(file_path)
-            
-            # Calculate file hash for change detection
-            file_hash = self.calculate_file_hash(file_path)
+            # Read the file once and feed the same bytes to the parser and the hasher
+            try:
+                with self.read_file_buffer(file_path, stat.st_size) as data:
+                    content_metadata = self.extract_content_metadata(file_path, data)
+                    file_hash = self.calculate_file_hash(file_path, data)
+            except OSError as e:
+                logger.warning(f"Failed to read {file_path}: {e}")
+                content_metadata = {}
+                file_hash = ""
             
             # Calculate size in KB (rounded, min 1KB if >0)
             size_kb = max(1, round(stat.st_size / 1024)) if stat.st_size > 0 else 0
@@ -92,6 +143,19 @@ class AssetIndexer:
             logger.warning(f"Failed to extract metadata from {file_path}: {e}")
             return None
 
+    def extract_many(self, file_paths: List[Path]) -> List[Optional[Dict[str, Any]]]:
+        """Extract metadata for many files, in input order, using worker processes when configured"""
+        if self.jobs <= 1 or len(file_paths) < 2:
+            return [self.extract_file_metadata(file_path) for file_path in file_paths]
+        
+        with WorkerPool(
+            min(self.jobs, len(file_paths)),
+            initializer=_init_extraction_worker,
+            initargs=(str(self.project_root), self.asset_configs)
+        ) as pool:
+            # Results come back in input order, so output matches the serial path
+            return pool.map(_extract_in_worker, file_paths)
+
     def determine_file_type(self, file_path: Path) -> str:
         """Determine the asset type based on file path"""
         for asset_type, config in self.asset_configs.items():
@@ -115,23 +179,35 @@ class AssetIndexer:
         
         return "general"
 
-    def extract_content_metadata(self, file_path: Path) -> Dict[str, Any]:
+    @contextmanager
+    def read_file_buffer(self, file_path: Path, size: int) -> Iterator[Union[bytes, mmap.mmap]]:
+        """Read a file into a single buffer, memory-mapping large files"""
+        with open(file_path, 'rb') as f:
+            if size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    yield mapped
+            else:
+                yield f.read()
+
+    def extract_content_metadata(self, file_path: Path, data: Union[bytes, mmap.mmap, None] = None) -> Dict[str, Any]:
         """Extract metadata from file content"""
         metadata = {}
         
         try:
             if file_path.suffix in ['.yaml', '.yml']:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = yaml.safe_load(f)
-                    if content:
-                        metadata.update(self.extract_yaml_metadata(content))
+                if data is None:
+                    data = file_path.read_bytes()
+                content = yaml.safe_load(data[:].decode('utf-8'))
+                if content:
+                    metadata.update(self.extract_yaml_metadata(content))
             elif file_path.suffix == '.json':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = json.load(f)
-                    if content:
-                        metadata.update(self.extract_json_metadata(content))
+                if data is None:
+                    data = file_path.read_bytes()
+                content = json.loads(data[:].decode('utf-8'))
+                if content:
+                    metadata.update(self.extract_json_metadata(content))
             elif file_path.suffix in ['.py', '.js', '.ts']:
-                metadata.update(self.extract_code_metadata(file_path))
+                metadata.update(self.extract_code_metadata(file_path, data))
         except Exception as e:
             logger.debug(f"Failed to extract content metadata from {file_path}: {e}")
         
@@ -169,17 +245,33 @@ class AssetIndexer:
         
         return metadata
 
-    def extract_code_metadata(self, file_path: Path) -> Dict[str, Any]:
+    def read_code_header(self, data: Union[bytes, mmap.mmap]) -> List[str]:
+        """Decode only the leading lines of a code file buffer"""
+        end = 0
+        for _ in range(CODE_HEADER_LINES):
+            newline = data.find(b'\n', end)
+            if newline == -1:
+                end = len(data)
+                break
+            end = newline + 1
+        
+        text = data[:end].decode('utf-8')
+        return text.replace('\r\n', '\n').replace('\r', '\n').splitlines()
+
+    def extract_code_metadata(self, file_path: Path, data: Union[bytes, mmap.mmap, None] = None) -> Dict[str, Any]:
         """Extract metadata from code files"""
         metadata = {}
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            if data is None:
+                with open(file_path, 'rb') as f:
+                    lines = [f.readline() for _ in range(CODE_HEADER_LINES)]
+                data = b''.join(lines)
+            lines = self.read_code_header(data)
                 
             # Extract docstring or comments
             description_lines = []
-            for line in lines[:20]:  # Check first 20 lines
+            for line in lines[:CODE_HEADER_LINES]:  # Check first 20 lines
                 line = line.strip()
                 if line.startswith('#') or line.startswith('"""') or line.startswith("'''"):
                     description_lines.append(line.lstrip('#').strip().strip('"').strip("'"))
@@ -192,8 +284,11 @@ class AssetIndexer:
         
         return metadata
 
-    def calculate_file_hash(self, file_path: Path) -> str:
+    def calculate_file_hash(self, file_path: Path, data: Union[bytes, mmap.mmap, None] = None) -> str:
         """Calculate SHA256 hash of file content"""
+        if data is not None:
+            return hashlib.sha256(data).hexdigest()
+        
         try:
             with open(file_path, 'rb') as f:
                 content = f.read()
@@ -209,18 +304,91 @@ class AssetIndexer:
         name = re.sub(r'[_-]', ' ', name)
         return name.title()
 
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """File manifest, loaded on first use"""
+        if self._manifest is None:
+            self._manifest = self.load_manifest()
+        return self._manifest
+
+    @property
+    def record_table(self) -> bool:
+        """Add per-record offset tables so binary chunks can be decoded lazily"""
+        if self._record_table is not None:
+            return self._record_table
+        if self._binary is False:
+            return False
+        return self.manifest.get("options", {}).get("record_table", False)
+
+    @property
+    def binary(self) -> bool:
+        """Also emit compact .kidx chunks next to the human-readable JSON ones"""
+        if self.record_table:
+            return True
+        if self._binary is not None:
+            return self._binary
+        return self.manifest.get("options", {}).get("binary", False)
+
+    def record_chunk_format(self) -> bool:
+        """Store the chunk format in the manifest; True when it differs from the previous run's"""
+        options = {"binary": self.binary, "record_table": self.record_table}
+        previous = self.manifest.get("options")
+        if previous == options:
+            return False
+        self.manifest["options"] = options
+        self.manifest_changed = True
+        # Manifests from before the format was recorded describe chunks of an unknown format
+        return previous is not None
+
+    def rewrite_all_chunks(self) -> None:
+        """Rewrite every chunk from the manifest, so no chunk keeps the previous run's format"""
+        logger.info("Chunk format changed, rewriting every chunk")
+        for asset_type, entries in self.manifest["types"].items():
+            type_index_path = self.indexes_path / asset_type
+            type_index_path.mkdir(exist_ok=True)
+            self.write_type_chunks(asset_type, type_index_path, entries, entries, force_update=True)
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Load the file manifest written by the previous indexing run"""
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    manifest = json.load(f)
+                if manifest.get("version") == MANIFEST_VERSION:
+                    return manifest
+                logger.info("Manifest version changed, rebuilding indexes from scratch")
+            except Exception as e:
+                logger.warning(f"Failed to read manifest {self.manifest_path}: {e}")
+        
+        return {"version": MANIFEST_VERSION, "types": {}}
+
+    def save_manifest(self) -> None:
+        """Persist the file manifest for the next incremental run"""
+        self.manifest_changed = False
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
     def index_asset_type(self, asset_type: str, config: Dict, indexes_path: Path, force_update: bool = False) -> bool:
-        """Index a specific asset type"""
+        """Index a specific asset type, re-extracting only files whose stat changed"""
         asset_path = self.project_root / config["path"]
         
-        if not asset_path.exists():
-            logger.warning(f"Asset path not found: {asset_path}")
-            return False
-        
         # Create type-specific index directory
         type_index_path = indexes_path / asset_type
         type_index_path.mkdir(exist_ok=True)
         
+        if not asset_path.exists():
+            logger.warning(f"Asset path not found: {asset_path}")
+            # Like an empty directory: drop the type's chunks and manifest entries, so neither
+            # this run nor a later update_paths() puts the deleted files back into bootstrap.json
+            previous = self.manifest["types"].get(asset_type)
+            if previous:
+                self.write_type_chunks(asset_type, type_index_path, previous, {}, force_update)
+            if self.manifest["types"].pop(asset_type, None) is not None:
+                self.manifest_changed = True
+            return False
+        
         # Find all relevant files
         files = []
         for ext in config["extensions"]:
@@ -228,27 +396,82 @@ class AssetIndexer:
         
         if not files:
             logger.info(f"No files found for {asset_type}")
+            previous = self.manifest["types"].get(asset_type)
+            if previous:
+                self.write_type_chunks(asset_type, type_index_path, previous, {}, force_update)
             return False
         
-        # Extract metadata for all files
-        file_metadata = []
+        # Reuse manifest entries for files whose size and mtime are unchanged
+        previous = self.manifest["types"].get(asset_type, {})
+        entries = {}
+        stats = {}
+        to_extract = []
+        reused = 0
         for file_path in files:
-            metadata = self.extract_file_metadata(file_path)
-            if metadata:
-                file_metadata.append(metadata)
+            relative_path = str(file_path.relative_to(self.project_root))
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                logger.warning(f"Failed to stat {file_path}: {e}")
+                continue
+            
+            entry = previous.get(relative_path)
+            if (not force_update and entry
+                    and entry["size"] == stat.st_size
+                    and entry["mtime_ns"] == stat.st_mtime_ns):
+                entries[relative_path] = entry
+                reused += 1
+                continue
+            
+            # Reserve the slot so entries keep discovery order once extracted
+            entries[relative_path] = None
+            stats[relative_path] = stat
+            to_extract.append(file_path)
+        
+        for file_path, metadata in zip(to_extract, self.extract_many(to_extract)):
+            relative_path = str(file_path.relative_to(self.project_root))
+            if not metadata:
+                del entries[relative_path]
+                continue
+            
+            stat = stats[relative_path]
+            entries[relative_path] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hash": metadata["hash"],
+                "metadata": metadata
+            }
         
-        # Group files by category
+        logger.info(f"🔍 {asset_type}: {len(entries) - reused} extracted, {reused} unchanged")
+        self.write_type_chunks(asset_type, type_index_path, previous, entries, force_update)
+        return True
+
+    def group_by_category(self, entries: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+        """Group manifest entries into category -> file metadata lists"""
         categories = {}
-        for metadata in file_metadata:
+        for entry in entries.values():
+            metadata = entry["metadata"]
             category = metadata.get('category', 'general')
             if category not in categories:
                 categories[category] = []
             categories[category].append(metadata)
+        return categories
+
+    def write_type_chunks(self, asset_type: str, type_index_path: Path, previous: Dict[str, Dict],
+                          entries: Dict[str, Dict], force_update: bool = False) -> None:
+        """Write the chunks of an asset type that differ from the previous run"""
+        old_categories = self.group_by_category(previous)
+        categories = self.group_by_category(entries)
         
         # Create chunked indexes
         for category, files in categories.items():
             chunk_name = category.lower().replace(' ', '_')
             chunk_path = type_index_path / f"{chunk_name}.json"
+            binary_chunk_path = type_index_path / f"{chunk_name}{BINARY_SUFFIX}"
+            
+            up_to_date = chunk_path.exists() and (not self.binary or binary_chunk_path.exists())
+            if not force_update and up_to_date and old_categories.get(category) == files:
+                continue
             
             chunk_data = {
                 "category": category,
@@ -262,33 +485,81 @@ class AssetIndexer:
             with open(chunk_path, 'w') as f:
                 json.dump(chunk_data, f, indent=2)
             
+            if self.binary:
+                write_chunk(binary_chunk_path, chunk_data, self.record_table)
+            elif binary_chunk_path.exists():
+                # Never leave a binary chunk that no longer matches its JSON twin
+                binary_chunk_path.unlink()
+            
             logger.info(f"📦 Created chunk: {asset_type}/{chunk_name} ({len(files)} files)")
         
-        return True
+        # Drop chunks whose category no longer has any files
+        live_chunks = {category.lower().replace(' ', '_') for category in categories}
+        for category in old_categories:
+            chunk_name = category.lower().replace(' ', '_')
+            if chunk_name in live_chunks:
+                continue
+            
+            removed = False
+            for suffix in (".json", BINARY_SUFFIX):
+                chunk_path = type_index_path / f"{chunk_name}{suffix}"
+                if chunk_path.exists():
+                    chunk_path.unlink()
+                    removed = True
+            if removed:
+                logger.info(f"🗑️ Removed chunk: {asset_type}/{chunk_name}")
+        
+        if self.manifest["types"].get(asset_type) != entries:
+            self.manifest["types"][asset_type] = entries
+            self.manifest_changed = True
+        self.type_results[asset_type] = categories
+
+    def get_type_categories(self, asset_type: str) -> Dict[str, List[Dict]]:
+        """Get category -> file metadata for an asset type without touching chunk files"""
+        if asset_type not in self.type_results:
+            self.type_results[asset_type] = self.group_by_category(self.manifest["types"].get(asset_type, {}))
+        return self.type_results[asset_type]
 
-    def index_all(self, force_update: bool = False) -> bool:
-        """Index all asset types"""
+    def get_type_chunks(self, asset_type: str) -> Dict[str, Dict[str, Any]]:
+        """Map chunk names to the category and files written to each chunk file"""
+        chunks = {}
+        for category, files in self.get_type_categories(asset_type).items():
+            # Categories that normalize to the same chunk name share one file; the last one written wins
+            chunks[category.lower().replace(' ', '_')] = {"category": category, "files": files}
+        return chunks
+
+    def index_all(self, force_update: bool = False, asset_types: List[str] = None) -> bool:
+        """Index all asset types, or only the given ones while keeping the others from the manifest"""
         logger.info("🚀 Starting asset indexing...")
         
         total_assets = 0
         successful_types = []
         
+        format_changed = self.record_chunk_format()
+        
         for asset_type, config in self.asset_configs.items():
+            if asset_types is not None and asset_type not in asset_types:
+                # Not re-indexed this run; keep its last results in bootstrap.json
+                if self.manifest["types"].get(asset_type):
+                    total_assets += sum(len(files) for files in self.get_type_categories(asset_type).values())
+                    successful_types.append(asset_type)
+                continue
+            
             logger.info(f"📁 Indexing {asset_type}...")
             
             if self.index_asset_type(asset_type, config, self.indexes_path, force_update):
-                # Count total files for this type
-                type_index_path = self.indexes_path / asset_type
-                if type_index_path.exists():
-                    chunk_files = list(type_index_path.glob("*.json"))
-                    type_total = 0
-                    for chunk_file in chunk_files:
-                        with open(chunk_file, 'r') as f:
-                            chunk_data = json.load(f)
-                            type_total += chunk_data.get('total_files', 0)
-                    total_assets += type_total
-                    successful_types.append(asset_type)
-                    logger.info(f"✅ {asset_type}: {type_total} files indexed")
+                # Count total files for this type from the in-memory results
+                categories = self.get_type_categories(asset_type)
+                type_total = sum(len(files) for files in categories.values())
+                total_assets += type_total
+                successful_types.append(asset_type)
+                logger.info(f"✅ {asset_type}: {type_total} files indexed")
+        
+        if format_changed:
+            self.rewrite_all_chunks()
+        
+        if self.manifest_changed:
+            self.save_manifest()
         
         # Create/update bootstrap index
         self.create_bootstrap_index(total_assets, successful_types)
@@ -296,8 +567,115 @@ class AssetIndexer:
         logger.info(f"🎉 Indexing complete! {total_assets} total assets across {len(successful_types)} types")
         return True
 
+    def asset_type_for_path(self, relative_path: Path) -> Optional[str]:
+        """Asset type whose directory contains a project-relative path, if any"""
+        for asset_type, config in self.asset_configs.items():
+            if relative_path.parts[:len(Path(config["path"]).parts)] == Path(config["path"]).parts:
+                return asset_type
+        return None
+
+    def update_paths(self, paths: Iterable[Union[str, Path]]) -> bool:
+        """Re-index only the given created, modified or deleted paths and refresh the bootstrap"""
+        # Without a manifest there is nothing to update incrementally
+        if not self.manifest["types"]:
+            logger.info("No manifest found, running a full index")
+            return self.index_all()
+        
+        project_root = self.project_root.resolve()
+        changed_by_type: Dict[str, Dict[str, Path]] = {}
+        for path in paths:
+            try:
+                # Paths are absolute or relative to the working directory, like watcher events
+                relative_path = Path(path).resolve().relative_to(project_root)
+            except ValueError:
+                continue
+            asset_type = self.asset_type_for_path(relative_path)
+            if asset_type is None:
+                continue
+            changed_by_type.setdefault(asset_type, {})[str(relative_path)] = self.project_root / relative_path
+        
+        if not changed_by_type:
+            return False
+        
+        format_changed = self.record_chunk_format()
+        
+        for asset_type, changed in changed_by_type.items():
+            config = self.asset_configs[asset_type]
+            previous = self.manifest["types"].get(asset_type, {})
+            entries = dict(previous)
+            stats = {}
+            to_extract = []
+            
+            for relative_path, file_path in changed.items():
+                if file_path.is_dir():
+                    # A created or moved-in directory: pick up every matching file below it
+                    candidates = [
+                        candidate for ext in config["extensions"] for candidate in file_path.rglob(f"*{ext}")
+                    ]
+                else:
+                    candidates = [file_path] if any(file_path.name.endswith(ext) for ext in config["extensions"]) else []
+                
+                if not file_path.exists():
+                    # Deleted file or directory: drop it and anything that lived below it
+                    entries.pop(relative_path, None)
+                    prefix = f"{relative_path}{os.sep}"
+                    for key in [key for key in entries if key.startswith(prefix)]:
+                        del entries[key]
+                    continue
+                
+                for candidate in candidates:
+                    candidate_key = str(candidate.relative_to(self.project_root))
+                    try:
+                        stat = candidate.stat()
+                    except OSError as e:
+                        logger.warning(f"Failed to stat {candidate}: {e}")
+                        entries.pop(candidate_key, None)
+                        continue
+                    
+                    entry = entries.get(candidate_key)
+                    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                        continue
+                    stats[candidate_key] = stat
+                    to_extract.append(candidate)
+            
+            for file_path, metadata in zip(to_extract, self.extract_many(to_extract)):
+                relative_path = str(file_path.relative_to(self.project_root))
+                if not metadata:
+                    entries.pop(relative_path, None)
+                    continue
+                
+                stat = stats[relative_path]
+                entries[relative_path] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "hash": metadata["hash"],
+                    "metadata": metadata
+                }
+            
+            removed = len(previous.keys() - entries.keys())
+            logger.info(f"🔍 {asset_type}: {len(to_extract)} extracted, {removed} removed")
+            type_index_path = self.indexes_path / asset_type
+            type_index_path.mkdir(exist_ok=True)
+            self.write_type_chunks(asset_type, type_index_path, previous, entries)
+        
+        if format_changed:
+            self.rewrite_all_chunks()
+        
+        if self.manifest_changed:
+            self.save_manifest()
+        
+        # Rebuild bootstrap.json and the search indexes from the in-memory results of every type
+        successful_types = [asset_type for asset_type in self.asset_configs if self.manifest["types"].get(asset_type)]
+        total_assets = sum(
+            len(files) for asset_type in successful_types for files in self.get_type_categories(asset_type).values()
+        )
+        self.create_bootstrap_index(total_assets, successful_types)
+        
+        logger.info(f"✅ Incremental update complete: {sum(len(changed) for changed in changed_by_type.values())} paths")
+        return True
+
     def create_bootstrap_index(self, total_assets: int, successful_types: List[str]) -> None:
-        """Create or update the bootstrap index"""
+        """Create or update the bootstrap index from the in-memory category results"""
         bootstrap_data = {
             "version": "1.0.0",
             "lastUpdated": datetime.now().isoformat(),
@@ -320,48 +698,43 @@ class AssetIndexer:
         
         # Add index information for each successful type
         for asset_type in successful_types:
-            type_index_path = self.indexes_path / asset_type
-            if type_index_path.exists():
-                chunk_files = list(type_index_path.glob("*.json"))
-                chunks = [f.stem for f in chunk_files]
-                type_total = 0
-                
-                # Count total files for this type
-                for chunk_file in chunk_files:
-                    try:
-                        with open(chunk_file, 'r') as f:
-                            chunk_data = json.load(f)
-                            type_total += chunk_data.get('total_files', 0)
-                    except Exception as e:
-                        logger.warning(f"Failed to read chunk file {chunk_file}: {e}")
-                
-                bootstrap_data["indexes"][asset_type] = {
-                    "chunks": chunks,
-                    "totalFiles": type_total
-                }
+            categories = self.get_type_categories(asset_type)
+            chunks = self.get_type_chunks(asset_type)
+            summaries = {chunk_name: self.summarize_chunk(chunk) for chunk_name, chunk in chunks.items()}
+            
+            # Tag -> chunks containing it, so tag-filtered listing only opens those chunks
+            tag_chunks = {}
+            for chunk_name, summary in summaries.items():
+                for tag in summary["tags"]:
+                    tag_chunks.setdefault(tag, []).append(chunk_name)
+            
+            bootstrap_data["indexes"][asset_type] = {
+                "chunks": list(chunks),
+                "totalFiles": sum(len(files) for files in categories.values()),
+                "categories": {category: category.lower().replace(' ', '_') for category in categories},
+                "chunkSummaries": summaries,
+                "tagChunks": tag_chunks
+            }
         
         # Add critical assets (priority files)
         for asset_type, config in self.asset_configs.items():
             if asset_type in successful_types:
                 critical_key = f"core{asset_type.capitalize()}"
-                critical_assets = []
                 
-                for priority_file in config.get("priority_files", []):
-                    # Find the priority file
-                    type_index_path = self.indexes_path / asset_type
-                    if type_index_path.exists():
-                        for chunk_file in type_index_path.glob("*.json"):
-                            try:
-                                with open(chunk_file, 'r') as f:
-                                    chunk_data = json.load(f)
-                                    for file_data in chunk_data.get("files", []):
-                                        if priority_file in file_data.get("name", ""):
-                                            critical_assets.append(file_data)
-                                            break
-                            except Exception as e:
-                                logger.warning(f"Failed to read chunk file {chunk_file}: {e}")
+                # Map file names to their metadata so each priority file is a dictionary hit
+                files_by_name = {}
+                for files in self.get_type_categories(asset_type).values():
+                    for file_data in files:
+                        files_by_name.setdefault(Path(file_data["path"]).name, file_data)
                 
-                bootstrap_data["critical"][critical_key] = critical_assets
+                bootstrap_data["critical"][critical_key] = [
+                    files_by_name[priority_file]
+                    for priority_file in config.get("priority_files", [])
+                    if priority_file in files_by_name
+                ]
+        
+        # Write the search index first; readers only trust it when its generation matches bootstrap.json
+        self.create_search_index(successful_types, bootstrap_data["lastUpdated"])
         
         # Write bootstrap index
         bootstrap_path = self.indexes_path / "bootstrap.json"
@@ -370,6 +743,32 @@ class AssetIndexer:
         
         logger.info(f"📋 Bootstrap index created: {total_assets} assets")
 
+    def summarize_chunk(self, chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """Category, record count and tag histogram of a chunk for the bootstrap"""
+        tags = Counter(tag for file_data in chunk["files"] for tag in record_tags(file_data))
+        return {
+            "category": chunk["category"],
+            "count": len(chunk["files"]),
+            "tags": dict(tags.most_common())
+        }
+
+    def iter_index_records(self, successful_types: List[str]):
+        """Yield (asset_type, chunk, category, record_index, file_data) in bootstrap order"""
+        for asset_type in successful_types:
+            for chunk_name, chunk in self.get_type_chunks(asset_type).items():
+                for record_index, file_data in enumerate(chunk["files"]):
+                    yield asset_type, chunk_name, chunk["category"], record_index, file_data
+
+    def create_search_index(self, successful_types: List[str], generation: str) -> None:
+        """Create the search index and path lookup table over every indexed file record"""
+        documents = write_search_index(
+            self.indexes_path / SEARCH_INDEX_FILE, self.iter_index_records(successful_types), generation
+        )
+        paths = write_path_index(
+            self.indexes_path / PATH_INDEX_FILE, self.iter_index_records(successful_types), generation
+        )
+        logger.info(f"🔎 Search index created: {documents} documents, {paths} paths")
+
 def main():
     """Main function for command line usage"""
     import argparse
@@ -378,19 +777,30 @@ def main():
     parser.add_argument("--force", action="store_true", help="Force update all indexes")
     parser.add_argument("--types", nargs="+", help="Specific asset types to index")
     parser.add_argument("--project-root", type=str, default="packages/data", help="Project root path")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes for metadata extraction (0 = one per CPU)")
+    parser.add_argument("--binary", action=argparse.BooleanOptionalAction,
+                        help="Also write compact binary (.kidx) chunks for fast loading "
+                             "(default: keep the previous run's setting)")
+    parser.add_argument("--record-table", action=argparse.BooleanOptionalAction,
+                        help="Add per-record offset tables to binary chunks for lazy loading (implies --binary; "
+                             "default: keep the previous run's setting)")
     
     args = parser.parse_args()
     
-    indexer = AssetIndexer(args.project_root)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    indexer = AssetIndexer(args.project_root, jobs=jobs, binary=args.binary, record_table=args.record_table)
     
     if args.types:
         # Index specific types
+        asset_types = []
         for asset_type in args.types:
             if asset_type in indexer.asset_configs:
-                config = indexer.asset_configs[asset_type]
-                indexer.index_asset_type(asset_type, config, indexer.indexes_path, args.force)
+                asset_types.append(asset_type)
             else:
                 logger.error(f"Unknown asset type: {asset_type}")
+        if asset_types:
+            indexer.index_all(args.force, asset_types)
     else:
         # Index all types
         indexer.index_all(args.force)
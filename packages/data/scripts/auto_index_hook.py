@@ -8,11 +8,20 @@ import os
 import sys
 import time
 import json
+import subprocess
+import threading
+from collections import Counter
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Any, Optional, Set
 import logging
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # Only --watch needs watchdog; git hook runs and manual updates work without it
+    Observer = None
+    FileSystemEventHandler = object
 
 # Add the scripts directory to path for imports
 sys.path.append(str(Path(__file__).parent))
@@ -25,95 +34,196 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Directory names whose contents never feed the indexes
+IGNORED_DIR_NAMES = {".git", "__pycache__", "node_modules"}
+
+# Editor swap/backup files and partial writes (vim, emacs, JetBrains, atomic-write temp files)
+TEMP_FILE_SUFFIXES = (".swp", ".swo", ".swx", ".tmp", ".temp", ".bak", ".part", "~")
+TEMP_FILE_PREFIXES = (".#", "#", ".~")
+TEMP_FILE_NAMES = {"4913", ".DS_Store"}
+
 class AssetChangeHandler(FileSystemEventHandler):
-    def __init__(self, indexer: AssetIndexer, project_root: Path):
+    def __init__(self, indexer: AssetIndexer, project_root: Path, update_delay: float = 5, max_wait: float = 30):
         self.indexer = indexer
         self.project_root = project_root
+        
+        # Pending changes, guarded by the condition and swapped out whole per batch
+        self.condition = threading.Condition()
         self.changed_files: Set[str] = set()
-        self.last_update = 0
-        self.update_delay = 5  # seconds
+        self.first_change = 0.0
+        self.last_change = 0.0
+        self.stopped = False
+        
+        # Update once no change arrived for update_delay seconds, but never later than
+        # max_wait seconds after the first change of a batch (trailing-edge debounce)
+        self.update_delay = update_delay
+        self.max_wait = max_wait
+        
+        # Single worker thread, so index updates never overlap
+        self.worker = threading.Thread(target=self.run_updates, name="kos-index-updater", daemon=True)
+        
+        # Watch exactly the directories and extensions the indexer indexes
+        self.watch_dirs = [project_root / config["path"] for config in indexer.asset_configs.values()]
+        self.relevant_extensions = {
+            ext for config in indexer.asset_configs.values() for ext in config["extensions"]
+        }
+        
+        # The indexer's own output must never trigger an update (feedback loop)
+        self.ignored_paths = [Path(os.path.abspath(indexer.indexes_path))]
         
-        # Directories to watch
-        self.watch_dirs = [
-            project_root / "skills",
-            project_root / "recipes", 
-            project_root / "scripts",
-            project_root / "config"
-        ]
+        # Dropped events by reason, reported with each update
+        self.dropped_events = Counter()
     
     def on_created(self, event):
-        if not event.is_directory:
-            self.handle_file_change(event.src_path, "created")
+        self.handle_file_change(event.src_path, "created", event.is_directory)
     
     def on_modified(self, event):
+        # Directory mtime changes carry no information beyond the file events below them
         if not event.is_directory:
             self.handle_file_change(event.src_path, "modified")
     
     def on_deleted(self, event):
-        if not event.is_directory:
-            self.handle_file_change(event.src_path, "deleted")
+        self.handle_file_change(event.src_path, "deleted", event.is_directory)
+    
+    def on_moved(self, event):
+        # A move removes the source and creates the destination (e.g. editors saving via rename)
+        self.handle_file_change(event.src_path, "moved", event.is_directory)
+        self.handle_file_change(event.dest_path, "moved", event.is_directory)
     
-    def handle_file_change(self, file_path: str, change_type: str):
+    def handle_file_change(self, file_path: str, change_type: str, is_directory: bool = False):
         """Handle file changes with debouncing"""
         file_path = Path(file_path)
         
-        # Only track relevant files
-        if self.is_relevant_file(file_path):
+        # Only track relevant files; directory events stand for everything below them
+        reason = self.drop_reason(file_path, is_directory)
+        if reason:
+            with self.condition:
+                self.dropped_events[reason] += 1
+            return
+        
+        with self.condition:
+            now = time.monotonic()
+            if not self.changed_files:
+                self.first_change = now
             self.changed_files.add(str(file_path))
-            logger.info(f"📝 File {change_type}: {file_path.name}")
-            
-            # Schedule update
-            current_time = time.time()
-            if current_time - self.last_update > self.update_delay:
-                self.schedule_update()
+            self.last_change = now
+            self.condition.notify()
+        logger.info(f"📝 File {change_type}: {file_path.name}")
+    
+    def drop_reason(self, file_path: Path, is_directory: bool = False) -> Optional[str]:
+        """Why an event for this path should be dropped, or None to index it"""
+        absolute_path = Path(os.path.abspath(file_path))
+        for ignored_path in self.ignored_paths:
+            if absolute_path == ignored_path or ignored_path in absolute_path.parents:
+                return "indexer_output"
+        if IGNORED_DIR_NAMES.intersection(absolute_path.parts):
+            return "ignored_dir"
+        if not is_directory and self.is_temp_file(file_path):
+            return "temp_file"
+        if not is_directory and not self.is_relevant_file(file_path):
+            return "irrelevant"
+        return None
+    
+    def is_temp_file(self, file_path: Path) -> bool:
+        """Check if file is an editor swap/backup file or a partial write"""
+        name = file_path.name
+        return name in TEMP_FILE_NAMES or name.startswith(TEMP_FILE_PREFIXES) or name.endswith(TEMP_FILE_SUFFIXES)
     
     def is_relevant_file(self, file_path: Path) -> bool:
         """Check if file is relevant for indexing"""
-        relevant_extensions = {'.yaml', '.yml', '.json', '.py', '.sh', '.js', '.ts'}
-        return file_path.suffix in relevant_extensions
+        return file_path.suffix in self.relevant_extensions
     
-    def schedule_update(self):
-        """Schedule an index update"""
-        self.last_update = time.time()
-        
-        # Use a timer to debounce rapid changes
-        import threading
-        timer = threading.Timer(self.update_delay, self.perform_update)
-        timer.start()
-    
-    def perform_update(self):
-        """Perform the actual index update"""
-        if not self.changed_files:
-            return
-        
-        logger.info(f"🔄 Updating indexes for {len(self.changed_files)} changed files...")
+    def get_stats(self) -> Dict[str, Any]:
+        """Pending and dropped event counts"""
+        with self.condition:
+            return {
+                "pending": len(self.changed_files),
+                "dropped": sum(self.dropped_events.values()),
+                "dropped_by_reason": dict(self.dropped_events)
+            }
+    
+    def start(self):
+        """Start the update worker"""
+        self.worker.start()
+    
+    def stop(self):
+        """Flush pending changes and stop the update worker"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        self.worker.join()
+    
+    def run_updates(self):
+        """Worker loop: one incremental update per debounced batch"""
+        while True:
+            batch = self.next_batch()
+            if batch is None:
+                return
+            self.perform_update(batch)
+    
+    def next_batch(self) -> Optional[Set[str]]:
+        """Wait until the pending batch is due and take it, or return None once stopped and drained"""
+        with self.condition:
+            while True:
+                if self.changed_files:
+                    now = time.monotonic()
+                    due = min(self.last_change + self.update_delay, self.first_change + self.max_wait)
+                    if self.stopped or now >= due:
+                        batch, self.changed_files = self.changed_files, set()
+                        return batch
+                    self.condition.wait(due - now)
+                elif self.stopped:
+                    return None
+                else:
+                    self.condition.wait()
+    
+    def perform_update(self, changed_files: Set[str]):
+        """Re-index only the files of one batch of changes"""
+        dropped = self.get_stats()["dropped_by_reason"]
+        logger.info(f"🔄 Updating indexes for {len(changed_files)} changed files "
+                    f"(dropped so far: {dropped or 'none'})...")
         
         try:
-            # Update indexes
-            self.indexer.index_all(force_update=True)
-            
-            # Clear changed files
-            self.changed_files.clear()
-            
-            logger.info("✅ Indexes updated successfully")
+            if self.indexer.update_paths(changed_files):
+                logger.info("✅ Indexes updated successfully")
+            else:
+                logger.info("No indexed assets affected")
             
         except Exception as e:
             logger.error(f"❌ Failed to update indexes: {e}")
+            # Merge the batch back so it is retried with the next one; once stopped, the
+            # flush gets one attempt so a persistent failure can't keep the worker spinning
+            with self.condition:
+                if self.stopped:
+                    logger.warning(f"⚠️ Dropping {len(changed_files)} changed files after failed final update")
+                    return
+                if not self.changed_files:
+                    self.first_change = time.monotonic()
+                    self.last_change = self.first_change
+                self.changed_files.update(changed_files)
+
+def git_output(args: List[str], cwd: Path) -> str:
+    """Run a git command and return its stdout"""
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
 
 def setup_git_hooks(project_root: Path):
     """Set up git hooks for automatic indexing"""
-    git_hooks_dir = project_root.parent.parent / ".git" / "hooks"
+    try:
+        git_hooks_dir = Path(os.path.abspath(
+            Path(project_root) / git_output(["rev-parse", "--git-path", "hooks"], project_root).strip()
+        ))
+    except (OSError, subprocess.CalledProcessError):
+        git_hooks_dir = project_root.parent.parent / ".git" / "hooks"
     
     if not git_hooks_dir.exists():
         logger.warning("Git hooks directory not found. Skipping git hook setup.")
         return
     
-    # Pre-commit hook
+    # Pre-commit hook; absolute paths so it works from wherever git runs it
     pre_commit_hook = git_hooks_dir / "pre-commit"
     hook_content = f"""#!/bin/bash
 # Auto-index hook for kOS
-cd {project_root}
-python3 scripts/auto_index_hook.py --git-hook
+python3 "{Path(__file__).resolve()}" --git-hook --project-root "{project_root.resolve()}"
 """
     
     try:
@@ -127,21 +237,46 @@ python3 scripts/auto_index_hook.py --git-hook
     except Exception as e:
         logger.error(f"Failed to install git hook: {e}")
 
-def run_git_hook_update():
-    """Run index update for git hook"""
+def get_staged_paths(project_root: Path) -> List[Path]:
+    """Absolute paths of staged additions, modifications, deletions and both sides of renames"""
+    toplevel = Path(git_output(["rev-parse", "--show-toplevel"], project_root).strip())
+    fields = git_output(["diff", "--cached", "--name-status", "-z"], project_root).split("\0")
+    
+    paths = []
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i]
+        # Renames and copies list the source and the destination path
+        count = 2 if status[0] in "RC" else 1
+        paths.extend(toplevel / path for path in fields[i + 1:i + 1 + count])
+        i += 1 + count
+    return paths
+
+def run_git_hook_update(project_root: Path = Path("packages/data")):
+    """Run index update for git hook, re-indexing only the staged paths"""
     try:
-        indexer = AssetIndexer()
-        indexer.index_all(force_update=True)
+        indexer = AssetIndexer(str(project_root))
+        if not indexer.manifest_path.exists():
+            # First run: nothing to update incrementally
+            indexer.index_all()
+        else:
+            staged_paths = get_staged_paths(project_root)
+            logger.info(f"🔄 Git hook: {len(staged_paths)} staged paths")
+            indexer.update_paths(staged_paths)
         logger.info("✅ Git hook index update completed")
         return True
     except Exception as e:
         logger.error(f"❌ Git hook index update failed: {e}")
         return False
 
-def start_file_watcher(project_root: Path):
+def start_file_watcher(project_root: Path, update_delay: float = 5, max_wait: float = 30):
     """Start file system watcher"""
+    if Observer is None:
+        logger.error("watchdog is not installed; run 'pip install watchdog' to use --watch")
+        return
+    
     indexer = AssetIndexer(str(project_root))
-    event_handler = AssetChangeHandler(indexer, project_root)
+    event_handler = AssetChangeHandler(indexer, project_root, update_delay, max_wait)
     observer = Observer()
     
     # Add watchers for each directory
@@ -152,6 +287,7 @@ def start_file_watcher(project_root: Path):
         else:
             logger.warning(f"Watch directory not found: {watch_dir}")
     
+    event_handler.start()
     observer.start()
     logger.info("🚀 File watcher started. Press Ctrl+C to stop.")
     
@@ -163,6 +299,8 @@ def start_file_watcher(project_root: Path):
         logger.info("🛑 File watcher stopped")
     
     observer.join()
+    event_handler.stop()
+    logger.info(f"📊 Dropped events: {event_handler.get_stats()['dropped_by_reason'] or 'none'}")
 
 def main():
     """Main function"""
@@ -174,6 +312,9 @@ def main():
     parser.add_argument("--setup-hooks", action="store_true", help="Set up git hooks")
     parser.add_argument("--update", action="store_true", help="Force update indexes")
     parser.add_argument("--project-root", type=str, default="packages/data", help="Project root path")
+    parser.add_argument("--delay", type=float, default=5, help="Seconds without changes before the watcher updates")
+    parser.add_argument("--max-wait", type=float, default=30,
+                        help="Longest the watcher delays an update while changes keep arriving")
     
     args = parser.parse_args()
     
@@ -181,7 +322,7 @@ def main():
     
     if args.git_hook:
         # Run as git hook
-        success = run_git_hook_update()
+        success = run_git_hook_update(project_root)
         sys.exit(0 if success else 1)
     
     elif args.setup_hooks:
@@ -196,7 +337,7 @@ def main():
     
     elif args.watch:
         # Start file watcher
-        start_file_watcher(project_root)
+        start_file_watcher(project_root, args.delay, args.max_wait)
     
     else:
         # Default: show help
@@ -0,0 +1,107 @@
+"""
+Bounded Cache for kOS
+Least-recently-used cache bounded by entry count, record count and bytes
+
+Shared by AgentBootstrap's chunk cache and PersonaLoaderV2's parsed-file caches.
+Each entry carries a stamp describing the source it was built from (a file's
+mtime and size, say); a lookup passes a check for that stamp, and an entry that
+fails it is dropped and counted as an invalidation.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class BoundedCache:
+    """LRU cache bounded by entries, total records and total bytes, with hit, miss, eviction and invalidation counts"""
+
+    def __init__(self, max_entries: Optional[int] = None, max_records: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+
+        # key -> (value, stamp, records, size_bytes), least recently used first
+        self.entries = OrderedDict()
+        self.total_records = 0
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def keys(self) -> List[Hashable]:
+        return list(self.entries.keys())
+
+    def values(self) -> List[Any]:
+        return [entry[0] for entry in self.entries.values()]
+
+    def get(self, key: Hashable, is_current: Optional[Callable[[Any], bool]] = None, default: Any = None) -> Any:
+        """Cached value, or default on a miss; an entry whose stamp fails is_current is dropped as stale"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        if is_current is not None and not is_current(entry[1]):
+            self.remove(key)
+            self.invalidations += 1
+            self.misses += 1
+            return default
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, stamp: Any = None, records: int = 0, size_bytes: int = 0) -> None:
+        """Cache a value and evict least recently used entries beyond the bounds"""
+        self.remove(key)
+        self.entries[key] = (value, stamp, records, size_bytes)
+        self.total_records += records
+        self.total_bytes += size_bytes
+
+        # Always keep the newest entry, even if it alone exceeds a bound
+        while len(self.entries) > 1 and self.over_limit():
+            self.remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def over_limit(self) -> bool:
+        if self.max_entries is not None and len(self.entries) > self.max_entries:
+            return True
+        if self.max_records is not None and self.total_records > self.max_records:
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+    def remove(self, key: Hashable) -> bool:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.total_records -= entry[2]
+        self.total_bytes -= entry[3]
+        return True
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.total_records = 0
+        self.total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "cached_bytes": self.total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,137 @@
+"""
+Index Daemon Client for kOS
+Talks to a running index_daemon.py over its Unix domain socket
+
+Each request is one line of JSON, {"method": ..., "params": {...}}, answered by
+one line of JSON, {"result": ...} or {"error": "..."}. A connection carries any
+number of requests in sequence. The socket lives in the user's private runtime
+directory ($XDG_RUNTIME_DIR, or a 0700 directory in the temp directory) under a
+name derived from the indexes path, so every process of a user that points at
+the same indexes finds the same daemon. Clients only talk to a daemon run by
+their own user.
+"""
+
+import json
+import os
+import socket
+import stat
+import struct
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+from shared_index import segment_name
+
+# Long enough to wait for a query queued behind an index update
+DEFAULT_TIMEOUT = 30.0
+
+
+class IndexDaemonError(Exception):
+    """Raised when the daemon reports an error or the connection to it breaks"""
+
+
+def runtime_dir() -> Path:
+    """Private per-user directory for daemon sockets, created on first use"""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime)
+
+    path = Path(tempfile.gettempdir()) / f"kos-index-{os.getuid()}"
+    try:
+        path.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+    # The temp directory is shared, so another user may have created the directory first
+    status = path.lstat()
+    if not stat.S_ISDIR(status.st_mode) or status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a private directory of this user")
+    return path
+
+
+def default_socket_path(indexes_path: Path) -> Path:
+    """Socket path of the daemon serving an indexes directory"""
+    return runtime_dir() / f"{segment_name(indexes_path)}.sock"
+
+
+def check_owner(path: Path) -> None:
+    """Refuse a socket file that belongs to another user"""
+    status = path.lstat()
+    if status.st_uid != os.getuid():
+        raise PermissionError(f"{path} belongs to uid {status.st_uid}, not this user")
+
+
+def peer_uid(sock: socket.socket) -> Optional[int]:
+    """Uid of the process at the other end of a connected Unix socket, where the platform reports it"""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid
+
+
+def encode_message(message: Any) -> bytes:
+    """Encode one protocol message as a JSON line"""
+    return json.dumps(message, separators=(",", ":")).encode('utf-8') + b"\n"
+
+
+class IndexClient:
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.stream = sock.makefile('rwb')
+        # One request in flight per connection
+        self.lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, indexes_path: Path = None, socket_path: Path = None,
+                timeout: float = DEFAULT_TIMEOUT) -> Optional["IndexClient"]:
+        """Connect to the daemon for an indexes directory (or socket), or None if none is running
+
+        Raises PermissionError when the socket or the daemon behind it belongs to another user.
+        """
+        path = Path(socket_path) if socket_path else default_socket_path(indexes_path)
+        try:
+            check_owner(path)
+        except FileNotFoundError:
+            return None
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            sock.close()
+            return None
+
+        # The file check above can race with a replaced socket; the peer's credentials can't
+        uid = peer_uid(sock)
+        if uid is not None and uid != os.getuid():
+            sock.close()
+            raise PermissionError(f"index daemon on {path} runs as uid {uid}, not this user")
+        return cls(sock)
+
+    def call(self, method: str, **params) -> Any:
+        """Send one request and return its result"""
+        with self.lock:
+            try:
+                self.stream.write(encode_message({"method": method, "params": params}))
+                self.stream.flush()
+                line = self.stream.readline()
+            except OSError as e:
+                raise IndexDaemonError(f"connection to index daemon failed: {e}") from e
+
+        if not line:
+            raise IndexDaemonError("index daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise IndexDaemonError(response["error"])
+        return response["result"]
+
+    def update_paths(self, paths: Iterable[Union[str, Path]]) -> bool:
+        """Push changed paths to the daemon, resolved against this process's working directory"""
+        return self.call("update_paths", paths=[os.path.abspath(path) for path in paths])
+
+    def close(self) -> None:
+        """Close the connection"""
+        self.stream.close()
+        self.sock.close()
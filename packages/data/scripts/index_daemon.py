@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Index Daemon for kOS
+Keeps the asset index hot in one long-running process and serves queries over a Unix socket
+
+The daemon brings the indexes up to date once at startup, then applies watcher
+batches in place with AssetIndexer.update_paths and answers AgentBootstrap
+queries (lookup, search, listing) from its in-memory chunk cache, so agents get
+fresh results without loading or parsing chunks themselves. Clients connect
+with index_client.IndexClient, or transparently via AgentBootstrap(daemon=True).
+"""
+
+import json
+import logging
+import os
+import signal
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# AgentBootstrap lives in agents/
+sys.path.append(str(Path(__file__).resolve().parent / "agents"))
+
+from asset_indexer import AssetIndexer
+from agent_bootstrap import AgentBootstrap
+from auto_index_hook import AssetChangeHandler, Observer
+from index_client import IndexClient, check_owner, default_socket_path, encode_message
+
+logger = logging.getLogger(__name__)
+
+# Queries answered by the AgentBootstrap method of the same name
+QUERY_METHODS = {
+    "load_bootstrap", "load_chunk", "search_assets", "search_ranked",
+    "get_asset_by_path", "get_assets_by_type", "get_chunk_summaries"
+}
+
+
+class DaemonChangeHandler(AssetChangeHandler):
+    """Watcher that applies each batch while holding the daemon lock, then reloads the daemon"""
+
+    def __init__(self, daemon: "IndexDaemon", update_delay: float, max_wait: float):
+        super().__init__(daemon.indexer, daemon.project_root, update_delay, max_wait)
+        self.daemon = daemon
+
+    def perform_update(self, changed_files):
+        with self.daemon.lock:
+            # The daemon replaces its indexer when another process rewrote the index
+            self.indexer = self.daemon.indexer
+            super().perform_update(changed_files)
+            self.daemon.reload()
+
+
+class IndexRequestHandler(socketserver.StreamRequestHandler):
+    """Answer JSON-line requests on one client connection"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                result = self.server.index_daemon.dispatch(request.get("method"), request.get("params") or {})
+                response = {"result": result}
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(encode_message(response))
+
+
+class IndexDaemon:
+    def __init__(self, project_root: str = "packages/data", socket_path: str = None, watch: bool = True,
+                 update_delay: float = 1.0, max_wait: float = 10.0):
+        self.project_root = Path(project_root)
+        self.indexer = AssetIndexer(str(self.project_root))
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path(self.indexer.indexes_path)
+
+        self.watch = watch
+        self.update_delay = update_delay
+        self.max_wait = max_wait
+
+        # Serializes queries with index updates, so no query reads a half-written chunk
+        self.lock = threading.RLock()
+        self.bootstrap: Optional[AgentBootstrap] = None
+        self.bootstrap_mtime = None
+        self.requests = 0
+
+    def reload(self) -> None:
+        """Reload bootstrap.json and with it the search and path indexes; cached chunks revalidate by mtime"""
+        self.bootstrap.load_bootstrap()
+        self.bootstrap_mtime = self.bootstrap_stat()
+
+    def bootstrap_stat(self) -> Optional[int]:
+        try:
+            return self.bootstrap.bootstrap_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self) -> None:
+        """Pick up an index rewritten by another process, e.g. a manual asset_indexer.py run"""
+        if self.bootstrap_stat() != self.bootstrap_mtime:
+            logger.info("🔄 Index changed on disk, reloading")
+            self.indexer = AssetIndexer(str(self.project_root))
+            self.reload()
+
+    def dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        """Answer one request"""
+        with self.lock:
+            self.requests += 1
+            if method == "ping":
+                return {"project_root": str(self.project_root.resolve()), "pid": os.getpid()}
+            if method == "stats":
+                return {"requests": self.requests, "cache": self.bootstrap.get_cache_stats()}
+
+            self.refresh()
+            if method == "update_paths":
+                # Lets hooks and tools without a watcher push their changes. Relative paths would
+                # resolve against the daemon's working directory, not the client's, so refuse them
+                paths = params.get("paths", [])
+                relative = [path for path in paths if not os.path.isabs(path)]
+                if relative:
+                    raise ValueError(f"update_paths needs absolute paths, got {relative!r}")
+                updated = self.indexer.update_paths(paths)
+                self.reload()
+                return updated
+            if method not in QUERY_METHODS:
+                raise ValueError(f"unknown method {method!r}")
+
+            if method == "load_bootstrap":
+                # Already current after refresh(); don't re-read it per request
+                return self.bootstrap.bootstrap_data or {}
+
+            result = getattr(self.bootstrap, method)(**params)
+            if method == "load_chunk" and result is not None:
+                result = {**result, "files": list(result["files"])}
+            return result
+
+    def claim_socket(self) -> None:
+        """Remove a stale socket file, refusing to start if another daemon still answers on it"""
+        if not self.socket_path.exists():
+            return
+        # Never remove or take over another user's socket
+        check_owner(self.socket_path)
+        client = IndexClient.connect(socket_path=self.socket_path, timeout=1.0)
+        if client is not None:
+            client.close()
+            raise RuntimeError(f"An index daemon is already serving {self.socket_path}")
+        self.socket_path.unlink()
+
+    def start_watcher(self):
+        """Watch the asset directories and apply changes in place, if watchdog is available"""
+        if Observer is None:
+            logger.warning("watchdog is not installed; serving without a watcher (send update_paths instead)")
+            return None, None
+
+        handler = DaemonChangeHandler(self, self.update_delay, self.max_wait)
+        observer = Observer()
+        for watch_dir in handler.watch_dirs:
+            if watch_dir.exists():
+                observer.schedule(handler, str(watch_dir), recursive=True)
+                logger.info(f"👀 Watching: {watch_dir}")
+        handler.start()
+        observer.start()
+        return handler, observer
+
+    def serve_forever(self) -> None:
+        """Bring the index up to date, then serve requests until interrupted"""
+        # Incremental against the manifest, so a warm restart only stats the tree
+        self.indexer.index_all()
+        self.bootstrap = AgentBootstrap(str(self.project_root), cache_max_bytes=None)
+        self.reload()
+
+        self.claim_socket()
+        server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), IndexRequestHandler)
+        server.daemon_threads = True
+        server.index_daemon = self
+        os.chmod(self.socket_path, 0o600)
+
+        handler, observer = self.start_watcher() if self.watch else (None, None)
+
+        # Remove the socket on SIGTERM too, not only on Ctrl+C
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        logger.info(f"🚀 Index daemon serving {self.socket_path}. Press Ctrl+C to stop.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("🛑 Index daemon stopped")
+        finally:
+            server.server_close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            if observer is not None:
+                observer.stop()
+                observer.join()
+                handler.stop()
+            # Record the chunks clients used, for agents that prefetch
+            self.bootstrap.close()
+
+
+def main():
+    """Main function for command line usage"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Index Daemon for kOS")
+    parser.add_argument("--project-root", type=str, default="packages/data", help="Project root path")
+    parser.add_argument("--socket", type=str, help="Socket path (default: derived from the indexes path, in $XDG_RUNTIME_DIR "
+                             "or a private temp directory)")
+    parser.add_argument("--no-watch", action="store_true", help="Do not watch the asset directories")
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds without changes before applying them")
+    parser.add_argument("--max-wait", type=float, default=10.0,
+                        help="Longest an update is delayed while changes keep arriving")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    daemon = IndexDaemon(args.project_root, args.socket, not args.no_watch, args.delay, args.max_wait)
+    daemon.serve_forever()
+
+if __name__ == "__main__":
+    main()
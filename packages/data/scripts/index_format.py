@@ -0,0 +1,216 @@
+"""
+Compact Binary Index Format for kOS
+Shared reader/writer for the .kidx files emitted next to the JSON indexes
+
+Layout of a .kidx file:
+    preamble   magic b"KIDX", format version (u16), marshal version (u16), TOC length (u32)
+    toc        marshal dict of section name -> (offset, length), offsets relative to the payload
+    payload    one marshal blob per section
+
+Chunk files carry the whole chunk as one blob ("chunk") for fast full loads.
+When written with a record table they also carry the chunk fields without
+files ("meta"), one marshal blob per file record ("records") and the record
+offset table ("offsets"), so a memory-mapped chunk can decode single records
+on access. The record table roughly doubles the file size.
+
+Equal strings are collapsed into one object before dumping, so marshal stores
+each distinct value (field names, type, category, tags, ...) once and
+back-references it, which acts as the string table. They are deliberately not
+sys.intern()ed: interned strings are re-interned one by one on load.
+
+The files are derived caches of the JSON indexes: readers fall back to JSON
+whenever a file is missing, stale or was written by an incompatible Python
+(marshal format) version.
+"""
+
+import marshal
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+
+MAGIC = b"KIDX"
+FORMAT_VERSION = 1
+BINARY_SUFFIX = ".kidx"
+
+_PREAMBLE = struct.Struct("<4sHHI")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class IndexFormatError(Exception):
+    """Raised when a binary index file cannot be decoded by this process"""
+
+
+def share_strings(value: Any, table: Dict[str, str]) -> Any:
+    """Recursively replace equal strings with one shared object so marshal stores them once"""
+    if isinstance(value, str):
+        return table.setdefault(value, value)
+    if isinstance(value, dict):
+        return {share_strings(k, table): share_strings(v, table) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(share_strings(v, table) for v in value)
+    return value
+
+
+def dumps_sections(sections: Dict[str, Any]) -> bytes:
+    """Serialize named sections into a single .kidx payload"""
+    blobs = []
+    toc = {}
+    offset = 0
+    for name, value in sections.items():
+        blob = value if isinstance(value, bytes) else marshal.dumps(share_strings(value, {}))
+        toc[name] = (offset, len(blob))
+        blobs.append(blob)
+        offset += len(blob)
+
+    toc_blob = marshal.dumps(toc)
+    preamble = _PREAMBLE.pack(MAGIC, FORMAT_VERSION, marshal.version, len(toc_blob))
+    return b"".join([preamble, toc_blob, *blobs])
+
+
+def write_sections(path: Path, sections: Dict[str, Any]) -> None:
+    """Atomically write named sections to a .kidx file"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps_sections(sections))
+    os.replace(tmp_path, path)
+
+
+def read_toc(buffer: Buffer) -> Tuple[Dict[str, Tuple[int, int]], int]:
+    """Validate the preamble and return the section table and payload start offset"""
+    if len(buffer) < _PREAMBLE.size:
+        raise IndexFormatError("file too short")
+
+    magic, format_version, marshal_version, toc_length = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise IndexFormatError("bad magic")
+    if format_version != FORMAT_VERSION:
+        raise IndexFormatError(f"unsupported format version {format_version}")
+    if marshal_version != marshal.version:
+        raise IndexFormatError(f"written with marshal version {marshal_version}")
+
+    toc_start = _PREAMBLE.size
+    toc = marshal.loads(buffer[toc_start:toc_start + toc_length])
+    return toc, toc_start + toc_length
+
+
+def section_bytes(buffer: Buffer, toc: Dict[str, Tuple[int, int]], payload_start: int, name: str) -> Buffer:
+    """Slice the raw bytes of a section out of a .kidx buffer"""
+    if name not in toc:
+        raise IndexFormatError(f"missing section {name!r}")
+    offset, length = toc[name]
+    start = payload_start + offset
+    return buffer[start:start + length]
+
+
+def load_section(buffer: Buffer, name: str) -> Any:
+    """Decode a single section of a .kidx buffer"""
+    toc, payload_start = read_toc(buffer)
+    return marshal.loads(section_bytes(buffer, toc, payload_start, name))
+
+
+def write_chunk(path: Path, chunk_data: Dict[str, Any], record_table: bool = False) -> None:
+    """Write a chunk in the binary format, optionally with a per-record offset table"""
+    if not record_table:
+        write_sections(path, {"chunk": chunk_data})
+        return
+    
+    meta = {key: value for key, value in chunk_data.items() if key != "files"}
+    records = [marshal.dumps(share_strings(record, {})) for record in chunk_data.get("files", [])]
+    
+    offsets = [0]
+    for blob in records:
+        offsets.append(offsets[-1] + len(blob))
+    
+    write_sections(path, {
+        "chunk": chunk_data,
+        "meta": meta,
+        "offsets": offsets,
+        "records": b"".join(records)
+    })
+
+
+def read_chunk(path: Path) -> Dict[str, Any]:
+    """Read a whole chunk written by write_chunk"""
+    with open(path, 'rb') as f:
+        return load_section(f.read(), "chunk")
+
+
+class LazyRecords(Sequence):
+    """File records of a chunk, decoded one at a time from the record section"""
+
+    def __init__(self, records: Buffer, offsets: List[int]):
+        self._records = records
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+        return marshal.loads(self._records[self._offsets[index]:self._offsets[index + 1]])
+
+
+class LazyChunk(Mapping):
+    """Read-only view of a binary chunk that decodes file records on access"""
+
+    def __init__(self, buffer: Buffer, mapped: Optional[mmap.mmap] = None):
+        toc, payload_start = read_toc(buffer)
+        self._buffer = buffer
+        self._mapped = mapped
+        self._meta = marshal.loads(section_bytes(buffer, toc, payload_start, "meta"))
+        self.files = LazyRecords(
+            section_bytes(buffer, toc, payload_start, "records"),
+            marshal.loads(section_bytes(buffer, toc, payload_start, "offsets"))
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "files":
+            return self.files
+        return self._meta[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._meta
+        yield "files"
+
+    def __len__(self) -> int:
+        return len(self._meta) + 1
+
+    def close(self) -> None:
+        """Release the underlying memory map"""
+        if self._mapped is not None:
+            self.files._records.release()
+            self._buffer.release()
+            self._mapped.close()
+            self._mapped = None
+
+
+def open_lazy_chunk(path: Path) -> LazyChunk:
+    """Memory-map a binary chunk for lazy, per-record access (needs a record table)"""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # Validate before exporting any buffer views, so the map can still be closed on error
+    try:
+        toc, _ = read_toc(mapped)
+        if "records" not in toc:
+            raise IndexFormatError("chunk was written without a record table")
+    except Exception:
+        mapped.close()
+        raise
+    return LazyChunk(memoryview(mapped), mapped)
+
+
+def decode_chunk(buffer: Buffer, lazy: bool = False) -> Mapping:
+    """Decode a binary chunk held in memory, lazily when asked and it has a record table"""
+    toc, payload_start = read_toc(buffer)
+    if lazy and "records" in toc:
+        return LazyChunk(buffer)
+    return marshal.loads(section_bytes(buffer, toc, payload_start, "chunk"))
@@ -5,18 +5,194 @@ Loads assets based on persona configuration and preferences
 Works with sharded directory structure and UUIDv7 naming
 """
 
+import copy
 import json
+import os
 import yaml
 import logging
 import glob
+import re
+import sys
+from bisect import bisect_left
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Callable, Optional, Set, Tuple
 from datetime import datetime
 
+# AgentBootstrap lives in agents/, shared helpers next to asset_indexer.py
+sys.path.append(str(Path(__file__).resolve().parent.parent / "agents"))
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from agent_bootstrap import AgentBootstrap
+from bounded_cache import BoundedCache
+from worker_pool import WorkerPool
+
 logger = logging.getLogger(__name__)
 
+# Bump when the persisted persona index layout changes
+PERSONA_INDEX_VERSION = 1
+
+# Bump when the persisted persona summary table layout changes
+PERSONA_SUMMARIES_VERSION = 1
+
+# Persona config fields returned by list_all_personas, with their defaults
+PERSONA_SUMMARY_FIELDS = (
+    ('id', ''), ('name', ''), ('base', ''), ('variant', ''),
+    ('author', ''), ('description', ''), ('tags', [])
+)
+
+# libyaml's parser when PyYAML was built with it; same results, several times faster
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Cache lookup result for a file that has to be parsed; a parsed file may itself be None
+MISSING = object()
+
+# Fewer uncached files than this are parsed in-process; a worker pool wouldn't pay off
+PARALLEL_PARSE_MIN_FILES = 32
+
+def parse_yaml_file(file_path: Path) -> Any:
+    """Parse one YAML file with the fastest available safe loader"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+def _parse_in_worker(file_path: Path) -> Tuple[Any, Optional[str]]:
+    """Parse a YAML file inside a worker process, returning the error message instead of raising"""
+    try:
+        return parse_yaml_file(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+def parse_yaml_files(file_paths: List[Path], pool: Optional[WorkerPool] = None) -> List[Tuple[Any, Optional[Exception]]]:
+    """Parse many YAML files, in input order, as (data, error) pairs, in the pool's workers when one is given"""
+    if pool is None or len(file_paths) < PARALLEL_PARSE_MIN_FILES:
+        results = []
+        for file_path in file_paths:
+            try:
+                results.append((parse_yaml_file(file_path), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+    
+    # Errors come back as their messages
+    return [(data, yaml.YAMLError(error) if error is not None else None)
+            for data, error in pool.map(_parse_in_worker, file_paths)]
+
+class ParsedFileCache(BoundedCache):
+    """LRU cache of parsed YAML files, valid while a file's (mtime_ns, size) is unchanged"""
+    
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 prepare: Optional[Callable[[Any], Any]] = None):
+        # Bounded by source file size
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes)
+        
+        # Applied once to each freshly parsed file before it is cached
+        self.prepare = prepare
+    
+    def load(self, file_path: Path) -> Tuple[Any, os.stat_result]:
+        """Parsed contents and stat of a YAML file, parsing it only if it changed since it was cached"""
+        # Stat before parsing, so a write during the parse invalidates the entry next time
+        stat = file_path.stat()
+        key = str(file_path)
+        data = self.lookup(key, stat)
+        if data is not MISSING:
+            return data, stat
+        
+        data = self.store(key, stat, parse_yaml_file(file_path))
+        return data, stat
+    
+    def load_many(self, file_paths: List[Path], pool: Optional[WorkerPool] = None) -> List[Tuple[Any, Optional[os.stat_result], Optional[Exception]]]:
+        """load() for many files, in input order, as (data, stat, error); only uncached files are parsed, in the pool when given"""
+        results = [None] * len(file_paths)
+        to_parse = []
+        for position, file_path in enumerate(file_paths):
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                results[position] = (None, None, e)
+                continue
+            
+            key = str(file_path)
+            data = self.lookup(key, stat)
+            if data is not MISSING:
+                results[position] = (data, stat, None)
+            else:
+                to_parse.append((position, key, stat))
+        
+        parsed = parse_yaml_files([file_paths[position] for position, _, _ in to_parse], pool)
+        for (position, key, stat), (data, error) in zip(to_parse, parsed):
+            if error is None:
+                data = self.store(key, stat, data)
+            results[position] = (data, stat, error)
+        
+        return results
+    
+    def lookup(self, key: str, stat: os.stat_result) -> Any:
+        """Cached parse of a file if its stat is unchanged, else MISSING; counts hits and misses"""
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        return self.get(key, stamp.__eq__, MISSING)
+    
+    def store(self, key: str, stat: os.stat_result, data: Any) -> Any:
+        """Prepare and cache a freshly parsed file"""
+        if self.prepare is not None:
+            data = self.prepare(data)
+        self.put(key, data, (stat.st_mtime_ns, stat.st_size), size_bytes=stat.st_size)
+        return data
+
+def intern_tags(asset_data: Any) -> Any:
+    """Intern an asset's tag strings, so tag lookups against the persona's sets compare by identity"""
+    if isinstance(asset_data, dict):
+        tags = asset_data.get('tags')
+        if isinstance(tags, list):
+            asset_data['tags'] = [sys.intern(tag) if isinstance(tag, str) else tag for tag in tags]
+        elif isinstance(tags, dict):
+            asset_data['tags'] = {sys.intern(key) if isinstance(key, str) else key: value
+                                  for key, value in tags.items()}
+    return asset_data
+
+class CompiledPreferences:
+    """Persona asset preferences compiled once for matching many assets"""
+    
+    def __init__(self, preferences: Dict[str, Any]):
+        self.preferences = preferences
+        self.categories = frozenset(preferences['categories'])
+        self.tags = frozenset(sys.intern(tag) if isinstance(tag, str) else tag for tag in preferences['tags'])
+        self.max_context_size = preferences['max_context_size']
+        
+        # One alternation over every pattern, matched against the lowercased name and description
+        patterns = [str(pattern).lower() for pattern in preferences['exclude_patterns']]
+        self.exclude = re.compile("|".join(map(re.escape, patterns))) if patterns else None
+        
+        # Position of each priority file by relative path; bare file names also match by name,
+        # but a path with directories must not promote same-named files elsewhere
+        self.priority = {}
+        for rank, priority_file in enumerate(preferences['priority_files']):
+            priority_path = Path(priority_file)
+            self.priority.setdefault(priority_path.as_posix(), rank)
+            if len(priority_path.parts) == 1:
+                self.priority.setdefault(priority_path.name, rank)
+    
+    def tag_matches(self, asset_tags: Any) -> int:
+        """Number of persona tags in an asset's raw `tags` value (list items, mapping keys or substrings)"""
+        if isinstance(asset_tags, (list, dict)):
+            try:
+                return len(self.tags.intersection(asset_tags))
+            except TypeError:
+                # Unhashable items; fall through to the element-wise test
+                pass
+        return sum(1 for tag in self.tags if tag in asset_tags)
+    
+    def excludes(self, asset_name: str, asset_description: str) -> bool:
+        """Whether an exclude pattern occurs in the asset's name or description, ignoring case"""
+        if self.exclude is None:
+            return False
+        return bool(self.exclude.search(asset_name.lower()) or self.exclude.search(asset_description.lower()))
+
 class PersonaLoaderV2:
-    def __init__(self, project_root: str = "packages/data"):
+    def __init__(self, project_root: str = "packages/data", asset_cache_max_entries: Optional[int] = 4096,
+                 asset_cache_max_bytes: Optional[int] = 64 * 1024 * 1024,
+                 bootstrap_loader: Optional[AgentBootstrap] = None, use_index: bool = True, jobs: int = 1):
         self.project_root = Path(project_root)
         self.personas_path = self.project_root / "personas"
         self.skills_path = self.project_root / "skills"
@@ -31,32 +207,115 @@ class PersonaLoaderV2:
             "agent_context": 100 * 1024  # 100KB
         }
         
-        # Cache for loaded personas and assets
-        self.persona_cache = {}
-        self.asset_cache = {}
+        # Parsed persona and asset files, shared by every persona this loader serves;
+        # bounds are by source file size
+        self.persona_cache = ParsedFileCache(max_entries=1024)
+        self.asset_cache = ParsedFileCache(asset_cache_max_entries, asset_cache_max_bytes, prepare=intern_tags)
+        
+        # Number of worker processes for parsing uncached YAML files (1 = serial), in one pool
+        # started on the first large batch and reused for the loader's lifetime
+        self.jobs = max(1, jobs)
+        self.parse_pool = WorkerPool(self.jobs) if self.jobs > 1 else None
+        
+        # Asset index whose raw tags rule out candidates before they are parsed; records of files
+        # changed since the last index run are ignored, so results always match a plain scan
+        self.use_index = use_index
+        self.bootstrap_loader = bootstrap_loader
+        self.bootstrap_mtime = None
+        
+        # Sorted persona file names -> paths and class directory -> first persona file,
+        # persisted next to the asset indexes and rebuilt when a persona directory changes
+        self.persona_index_path = self.project_root / "indexes" / "persona_index.json"
+        self.persona_index = None
+        
+        # Listing fields of every persona file, validated by file mtime and size, so listing
+        # personas reads this one file instead of parsing every persona
+        self.persona_summaries_path = self.project_root / "indexes" / "persona_summaries.json"
+        self.persona_summaries = None
         
     def find_persona_by_id(self, persona_id: str) -> Optional[Path]:
         """Find persona file by ID (supports partial matching)"""
-        # Search in all persona subdirectories
-        for class_dir in self.personas_path.iterdir():
-            if class_dir.is_dir():
-                # Look for files matching the persona_id pattern
-                pattern = f"{persona_id}*.yml"
-                matches = list(class_dir.glob(pattern))
-                if matches:
-                    return matches[0]
+        index = self.get_persona_index()
+        names = index['names']
+        
+        # Prefix search: the first file name at or after the ID is the smallest match
+        i = bisect_left(names, persona_id)
+        if i < len(names) and names[i].startswith(persona_id):
+            return self.personas_path / index['paths'][i]
         return None
     
     def find_persona_by_base(self, base_name: str) -> Optional[Path]:
         """Find persona file by base class name"""
-        base_dir = self.personas_path / base_name
-        if base_dir.exists():
-            # Find the first .yml file in the directory
-            yml_files = list(base_dir.glob("*.yml"))
-            if yml_files:
-                return yml_files[0]  # Return the first one found
+        path = self.get_persona_index()['bases'].get(base_name)
+        return self.personas_path / path if path else None
+    
+    def persona_dir_mtimes(self) -> Dict[str, int]:
+        """mtime of the personas directory and each class directory (changes on add/remove/rename)"""
+        mtimes = {".": self.personas_path.stat().st_mtime_ns}
+        for class_dir in self.personas_path.iterdir():
+            if class_dir.is_dir():
+                mtimes[class_dir.name] = class_dir.stat().st_mtime_ns
+        return mtimes
+    
+    def get_persona_index(self) -> Dict[str, Any]:
+        """Persona file index, loaded from disk or rebuilt when a persona directory changed"""
+        try:
+            mtimes = self.persona_dir_mtimes()
+        except FileNotFoundError:
+            return {'names': [], 'paths': [], 'bases': {}}
+        
+        if self.persona_index is None:
+            self.persona_index = self.load_persona_index()
+        if self.persona_index is None or self.persona_index['dirs'] != mtimes:
+            self.persona_index = self.build_persona_index(mtimes)
+            self.save_persona_index()
+        return self.persona_index
+    
+    def build_persona_index(self, mtimes: Dict[str, int]) -> Dict[str, Any]:
+        """Scan the class directories once for persona files"""
+        entries = []
+        bases = {}
+        for class_dir in self.personas_path.iterdir():
+            if class_dir.is_dir():
+                persona_files = sorted(class_dir.glob("*.yml"))
+                if persona_files:
+                    bases[class_dir.name] = str(persona_files[0].relative_to(self.personas_path))
+                entries.extend((f.name, str(f.relative_to(self.personas_path))) for f in persona_files)
+        entries.sort()
+        
+        logger.info(f"🗂️ Indexed {len(entries)} persona files in {len(bases)} classes")
+        return {
+            'version': PERSONA_INDEX_VERSION,
+            'dirs': mtimes,
+            'names': [name for name, _ in entries],
+            'paths': [path for _, path in entries],
+            'bases': bases
+        }
+    
+    def load_persona_index(self) -> Optional[Dict[str, Any]]:
+        """Load the persisted persona index, if present and current"""
+        try:
+            with open(self.persona_index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == PERSONA_INDEX_VERSION:
+                return index
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to read persona index {self.persona_index_path}: {e}")
         return None
     
+    def save_persona_index(self) -> None:
+        """Persist the persona index for the next process"""
+        tmp_path = self.persona_index_path.with_name(f"{self.persona_index_path.name}.{os.getpid()}.tmp")
+        try:
+            self.persona_index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.persona_index, f)
+            os.replace(tmp_path, self.persona_index_path)
+        except OSError as e:
+            logger.warning(f"Failed to save persona index {self.persona_index_path}: {e}")
+    
     def load_persona_config(self, persona_identifier: str) -> Optional[Dict[str, Any]]:
         """Load persona configuration file by ID or base name"""
         
@@ -70,11 +329,13 @@ class PersonaLoaderV2:
             return None
         
         try:
-            with open(persona_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            # Deep copy so neither the per-load metadata below nor callers' edits to nested
+            # values leak into the cached parse
+            config, stat = self.persona_cache.load(persona_file)
+            config = copy.deepcopy(config)
             
             # Validate file size
-            file_size = persona_file.stat().st_size
+            file_size = stat.st_size
             if file_size > self.size_limits["persona_files"]:
                 logger.warning(f"Persona config file {persona_file} exceeds size limit: {file_size} bytes")
             
@@ -154,123 +415,408 @@ class PersonaLoaderV2:
             'chunks_loaded': 0
         }
         
-        # Load by asset types
+        # Stat every candidate, then pack the best-ranked ones into the context budget
+        compiled = CompiledPreferences(preferences)
+        candidates = []
         for asset_type in preferences['asset_types']:
-            if asset_type not in loaded_assets['assets']:
-                loaded_assets['assets'][asset_type] = []
-            
-            # Get all assets of this type from sharded directories
-            type_assets = self.load_assets_by_type(asset_type, preferences)
-            loaded_assets['assets'][asset_type].extend(type_assets)
+            loaded_assets['assets'].setdefault(asset_type, [])
+            candidates.extend(self.collect_asset_candidates(asset_type, compiled))
         
-        # Calculate total size and chunks
-        for asset_type, assets in loaded_assets['assets'].items():
-            for asset in assets:
-                loaded_assets['total_size'] += asset.get('size', 0)
-                loaded_assets['chunks_loaded'] += 1
+        packed, skipped = self.pack_assets(candidates, compiled)
+        for asset in packed:
+            loaded_assets['assets'][asset['_metadata']['asset_type']].append(asset)
+            loaded_assets['total_size'] += asset['_metadata']['file_size']
+            loaded_assets['chunks_loaded'] += 1
+        loaded_assets['assets_skipped'] = skipped
         
-        # Check context size limit
-        if loaded_assets['total_size'] > preferences['max_context_size']:
-            logger.warning(f"Persona {persona_identifier} assets exceed context size limit: {loaded_assets['total_size']} bytes")
+        if skipped:
+            logger.info(f"✂️ Skipped {skipped} assets that did not fit the {preferences['max_context_size']} byte context budget of persona {persona_identifier}")
         
         logger.info(f"📦 Loaded {loaded_assets['chunks_loaded']} assets for persona {persona_identifier} ({loaded_assets['total_size']} bytes)")
         
         return loaded_assets
     
-    def load_assets_by_type(self, asset_type: str, preferences: Dict[str, Any]) -> List[Dict]:
-        """Load assets of a specific type from sharded directories"""
-        assets = []
-        
-        # Determine the base path for this asset type
+    def get_asset_type_path(self, asset_type: str) -> Optional[Path]:
+        """Base directory of an asset type, or None if the type is unknown or missing"""
         if asset_type == 'skills':
             base_path = self.skills_path
         elif asset_type == 'recipes':
             base_path = self.recipes_path
         else:
             logger.warning(f"Unknown asset type: {asset_type}")
-            return assets
+            return None
         
         if not base_path.exists():
             logger.warning(f"Asset type directory not found: {base_path}")
-            return assets
+            return None
+        
+        return base_path
+    
+    def collect_asset_candidates(self, asset_type: str, preferences: CompiledPreferences) -> List[Dict[str, Any]]:
+        """Stat the asset files of a type that may match the preferences, without parsing them"""
+        base_path = self.get_asset_type_path(asset_type)
+        if base_path is None:
+            return []
+        
+        indexed = self.get_indexed_records(asset_type) if preferences.tags else None
+        candidates = []
         
         # Load from all subdirectories (sharded)
         for category_dir in base_path.iterdir():
-            if category_dir.is_dir():
-                # Load all .yml files in this category
-                for asset_file in category_dir.glob("*.yml"):
-                    try:
-                        with open(asset_file, 'r', encoding='utf-8') as f:
-                            asset_data = yaml.safe_load(f)
-                        
-                        # Add file metadata
-                        asset_data['_metadata'] = {
-                            'file_path': str(asset_file),
-                            'file_size': asset_file.stat().st_size,
-                            'asset_type': asset_type,
-                            'category': category_dir.name
-                        }
-                        
-                        # Filter by preferences
-                        if self.matches_preferences(asset_data, preferences):
-                            assets.append(asset_data)
-                            
-                    except Exception as e:
-                        logger.error(f"Failed to load asset {asset_file}: {e}")
-        
-        return assets
-    
-    def matches_preferences(self, asset_data: Dict, preferences: Dict[str, Any]) -> bool:
-        """Check if an asset matches the persona preferences"""
+            if not category_dir.is_dir():
+                continue
+            if preferences.categories and category_dir.name not in preferences.categories:
+                continue
+            
+            for asset_file in category_dir.glob("*.yml"):
+                candidate = self.make_candidate(asset_file, asset_type, category_dir.name, preferences)
+                if candidate is None:
+                    continue
+                if indexed is not None:
+                    candidate['tag_overlap'] = self.indexed_tag_overlap(candidate, indexed, preferences)
+                    if candidate['tag_overlap'] == 0:
+                        continue
+                candidates.append(candidate)
+        
+        return candidates
+    
+    def get_indexed_records(self, asset_type: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Indexed records of an asset type by project-relative path, or None when the index doesn't cover the type"""
+        bootstrap = self.get_bootstrap_loader()
+        if bootstrap is None:
+            return None
+        if asset_type not in bootstrap.bootstrap_data.get('indexes', {}):
+            return None
+        
+        # The index chunks by the category declared in each file, while personas filter on the
+        # category directory, so every chunk of the type is read (they are cached)
+        return {Path(file_data['path']).as_posix(): file_data
+                for file_data in bootstrap.get_assets_by_type(asset_type)}
+    
+    def indexed_tag_overlap(self, candidate: Dict[str, Any], indexed: Dict[str, Dict[str, Any]],
+                            preferences: CompiledPreferences) -> Optional[int]:
+        """Persona tag overlap of a candidate from its index record, or None when the file has no
+        current record (added or edited since the last index run) and must be parsed to tell"""
+        file_data = indexed.get(candidate['relative_path'])
+        if file_data is None:
+            return None
+        
+        # Same size and mtime fields the indexer records, so a changed file never matches its record
+        size_kb = max(1, round(candidate['size'] / 1024)) if candidate['size'] > 0 else 0
+        modified = datetime.fromtimestamp(candidate['mtime']).isoformat()
+        if file_data.get('size') != size_kb or file_data.get('lastModified') != modified:
+            return None
+        
+        # The indexed tags are the file's raw `tags` value, so this is the same test as
+        # matches_preferences; the bootstrap tag map is normalized and can't be used here
+        try:
+            return preferences.tag_matches(file_data.get('tags') or [])
+        except TypeError:
+            return 0
+    
+    def get_bootstrap_loader(self) -> Optional[AgentBootstrap]:
+        """AgentBootstrap over the asset index, reloaded when bootstrap.json changes; None without an index"""
+        if not self.use_index:
+            return None
+        if self.bootstrap_loader is None:
+            self.bootstrap_loader = AgentBootstrap(str(self.project_root))
+        
+        try:
+            mtime = self.bootstrap_loader.bootstrap_path.stat().st_mtime_ns
+        except OSError:
+            # Not indexed yet; scan the directories instead
+            return None
+        if mtime != self.bootstrap_mtime:
+            self.bootstrap_loader.load_bootstrap()
+            self.bootstrap_mtime = mtime
+        
+        return self.bootstrap_loader if self.bootstrap_loader.bootstrap_data else None
+    
+    def make_candidate(self, asset_file: Path, asset_type: str, category: str,
+                       preferences: CompiledPreferences) -> Optional[Dict[str, Any]]:
+        """Stat an asset file into a packing candidate"""
+        try:
+            stat = asset_file.stat()
+        except FileNotFoundError:
+            # Removed while the directory was being listed
+            return None
+        except OSError as e:
+            logger.error(f"Failed to load asset {asset_file}: {e}")
+            return None
+        
+        relative_path = self.relative_asset_path(asset_file)
+        return {
+            'path': asset_file,
+            'relative_path': relative_path,
+            'asset_type': asset_type,
+            'category': category,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'priority': preferences.priority.get(relative_path, preferences.priority.get(asset_file.name)),
+            # Known without parsing when the persona has no tags; otherwise filled in from the index
+            'tag_overlap': None if preferences.tags else 0
+        }
+    
+    def relative_asset_path(self, asset_file: Path) -> str:
+        """Asset path relative to the project root, as written in priority_files"""
+        try:
+            return asset_file.relative_to(self.project_root).as_posix()
+        except ValueError:
+            return asset_file.as_posix()
+    
+    def load_asset(self, candidate: Dict[str, Any], preferences: CompiledPreferences) -> Optional[Dict]:
+        """Parse a candidate asset, returning it only if it matches the persona preferences"""
+        return self.load_assets([candidate], preferences)[0]
+    
+    def load_assets(self, candidates: List[Dict[str, Any]], preferences: CompiledPreferences) -> List[Optional[Dict]]:
+        """Parse candidate assets (uncached ones in parallel), each kept only if it matches the persona preferences"""
+        loaded = []
+        parsed = self.asset_cache.load_many([candidate['path'] for candidate in candidates], self.parse_pool)
+        for candidate, (asset_data, stat, error) in zip(candidates, parsed):
+            asset_file = candidate['path']
+            try:
+                if error is not None:
+                    raise error
+                
+                # Deep copy so neither the per-persona metadata nor callers' edits to nested
+                # values leak into the cached parse
+                asset_data = copy.deepcopy(asset_data)
+                
+                # Add file metadata
+                asset_data['_metadata'] = {
+                    'file_path': str(asset_file),
+                    'file_size': stat.st_size,
+                    'asset_type': candidate['asset_type'],
+                    'category': candidate['category']
+                }
+                
+                # Filter by preferences
+                if self.matches_preferences(asset_data, preferences):
+                    loaded.append(asset_data)
+                    continue
+                
+            except Exception as e:
+                logger.error(f"Failed to load asset {asset_file}: {e}")
+            
+            loaded.append(None)
+        
+        return loaded
+    
+    def pack_assets(self, candidates: List[Dict[str, Any]], preferences: CompiledPreferences) -> Tuple[List[Dict], int]:
+        """Greedily select the best-ranked matching assets that fit max_context_size
+        
+        Priority files go first, in the order they are listed; the remaining assets are
+        ranked by tag overlap, then smallest first. Ranking uses stat sizes and the indexed
+        tag overlap, so only candidates without a current index record are parsed up front;
+        the rest are parsed in rank order until the budget is full. A candidate larger than
+        the budget left is skipped by its stat size alone, so it is never parsed. Returns the
+        selected assets and the number of candidates skipped for the budget; as skipped files
+        aren't parsed, the count can include some that would have failed the preferences.
+        """
+        remaining = preferences.max_context_size
+        selected = []
+        skipped = 0
+        
+        priority = sorted((c for c in candidates if c['priority'] is not None),
+                          key=lambda c: (c['priority'], c['relative_path']))
+        for candidate in priority:
+            if candidate['size'] > remaining:
+                skipped += 1
+                continue
+            asset = self.load_asset(candidate, preferences)
+            if asset is not None:
+                selected.append(asset)
+                remaining -= candidate['size']
+        
+        # Rank what can still fit by tag overlap and size; only candidates whose overlap the
+        # index doesn't know are parsed for it. Entries are (-overlap, size, path, candidate, asset)
+        ranked = []
+        unranked = []
+        for candidate in candidates:
+            if candidate['priority'] is not None:
+                continue
+            if candidate['size'] > remaining:
+                skipped += 1
+                continue
+            if candidate['tag_overlap'] is None:
+                unranked.append(candidate)
+            else:
+                ranked.append((-candidate['tag_overlap'], candidate['size'], candidate['relative_path'], candidate, None))
+        
+        for candidate, asset in zip(unranked, self.load_assets(unranked, preferences)):
+            if asset is not None:
+                overlap = preferences.tag_matches(asset.get('tags') or [])
+                ranked.append((-overlap, candidate['size'], candidate['relative_path'], candidate, asset))
+        
+        ranked.sort(key=lambda entry: entry[:3])
+        
+        # Parse in rank order, one batch at a time: the run of next-ranked candidates that fit the
+        # budget together, so the result equals a greedy pass yet nothing unneeded is parsed
+        position = 0
+        while position < len(ranked):
+            if ranked[position][1] > remaining:
+                skipped += 1
+                position += 1
+                continue
+            
+            end, batch_size = position, 0
+            while end < len(ranked) and batch_size + ranked[end][1] <= remaining:
+                batch_size += ranked[end][1]
+                end += 1
+            
+            batch = ranked[position:end]
+            parsed = iter(self.load_assets([entry[3] for entry in batch if entry[4] is None], preferences))
+            for _, size, _, _, asset in batch:
+                if asset is None:
+                    asset = next(parsed)
+                if asset is not None:
+                    selected.append(asset)
+                    remaining -= size
+            position = end
+        
+        return selected, skipped
+    
+    def load_assets_by_type(self, asset_type: str, preferences: Dict[str, Any]) -> List[Dict]:
+        """Load all assets of a specific type matching the preferences, without a size budget"""
+        compiled = CompiledPreferences(preferences)
+        candidates = self.collect_asset_candidates(asset_type, compiled)
+        return [asset for asset in self.load_assets(candidates, compiled) if asset is not None]
+    
+    def matches_preferences(self, asset_data: Dict, preferences: CompiledPreferences) -> bool:
+        """Check if an asset matches the persona preferences (a preferences dict is compiled first)"""
+        if not isinstance(preferences, CompiledPreferences):
+            preferences = CompiledPreferences(preferences)
+        
         # Check categories
-        if preferences['categories']:
+        if preferences.categories:
             asset_category = asset_data.get('_metadata', {}).get('category', '')
-            if asset_category not in preferences['categories']:
+            if asset_category not in preferences.categories:
                 return False
         
         # Check tags
-        if preferences['tags']:
-            asset_tags = asset_data.get('tags', [])
-            if not any(tag in asset_tags for tag in preferences['tags']):
+        if preferences.tags:
+            if not preferences.tag_matches(asset_data.get('tags', [])):
                 return False
         
         # Check exclude patterns
-        if preferences['exclude_patterns']:
-            asset_name = asset_data.get('name', '')
-            asset_description = asset_data.get('description', '')
-            for pattern in preferences['exclude_patterns']:
-                if pattern.lower() in asset_name.lower() or pattern.lower() in asset_description.lower():
-                    return False
+        if preferences.excludes(asset_data.get('name', ''), asset_data.get('description', '')):
+            return False
         
         return True
     
     def list_all_personas(self) -> List[Dict[str, Any]]:
         """List all available personas with their metadata"""
-        personas = []
+        table, uncached = self.get_persona_summaries()
         
-        for class_dir in self.personas_path.iterdir():
-            if class_dir.is_dir():
-                for persona_file in class_dir.glob("*.yml"):
-                    try:
-                        with open(persona_file, 'r', encoding='utf-8') as f:
-                            config = yaml.safe_load(f)
-                        
-                        personas.append({
-                            'id': config.get('id', ''),
-                            'name': config.get('name', ''),
-                            'base': config.get('base', ''),
-                            'variant': config.get('variant', ''),
-                            'author': config.get('author', ''),
-                            'description': config.get('description', ''),
-                            'tags': config.get('tags', []),
-                            'file_path': str(persona_file)
-                        })
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to load persona metadata {persona_file}: {e}")
+        personas = []
+        for relative_path in table['files']:
+            entry = table['entries'].get(relative_path)
+            summary = entry['summary'] if entry else uncached.get(relative_path)
+            if summary is not None:
+                # Deep copy so callers' edits (e.g. to tags) never reach the summary table
+                personas.append({**copy.deepcopy(summary), 'file_path': str(self.personas_path / relative_path)})
         
         return personas
     
+    def get_persona_summaries(self) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """Persona summary table, brought up to date by re-parsing only added or changed persona files
+        
+        Returns the table and the summaries of files that parsed but can't be stored as JSON.
+        """
+        mtimes = self.persona_dir_mtimes()
+        if self.persona_summaries is None:
+            self.persona_summaries = self.load_persona_summaries() or {
+                'version': PERSONA_SUMMARIES_VERSION, 'dirs': None, 'files': [], 'entries': {}
+            }
+        table = self.persona_summaries
+        changed = False
+        
+        # Files were added, removed or renamed; list them again in directory order
+        if table['dirs'] != mtimes:
+            table['files'] = [
+                str(persona_file.relative_to(self.personas_path))
+                for class_dir in self.personas_path.iterdir() if class_dir.is_dir()
+                for persona_file in class_dir.glob("*.yml")
+            ]
+            table['dirs'] = mtimes
+            listed = set(table['files'])
+            table['entries'] = {path: entry for path, entry in table['entries'].items() if path in listed}
+            changed = True
+        
+        stale = []
+        for relative_path in table['files']:
+            entry = table['entries'].get(relative_path)
+            try:
+                stat = (self.personas_path / relative_path).stat()
+            except OSError:
+                stat = None
+            if entry is None or stat is None or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                stale.append(relative_path)
+        
+        uncached = {}
+        parsed = self.persona_cache.load_many([self.personas_path / path for path in stale], self.parse_pool)
+        for relative_path, (config, stat, error) in zip(stale, parsed):
+            if table['entries'].pop(relative_path, None) is not None:
+                changed = True
+            try:
+                if error is not None:
+                    raise error
+                summary = {field: config.get(field, default) for field, default in PERSONA_SUMMARY_FIELDS}
+            except Exception as e:
+                logger.error(f"Failed to load persona metadata {self.personas_path / relative_path}: {e}")
+                continue
+            
+            # Only summaries that survive a JSON round trip unchanged (no dates etc.) are persisted
+            try:
+                storable = json.loads(json.dumps(summary)) == summary
+            except (TypeError, ValueError):
+                storable = False
+            if storable:
+                table['entries'][relative_path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'summary': summary}
+                changed = True
+            else:
+                uncached[relative_path] = summary
+        
+        if changed:
+            self.save_persona_summaries()
+        return table, uncached
+    
+    def load_persona_summaries(self) -> Optional[Dict[str, Any]]:
+        """Load the persisted persona summary table, if present and current"""
+        try:
+            with open(self.persona_summaries_path, 'r', encoding='utf-8') as f:
+                table = json.load(f)
+            if table.get('version') == PERSONA_SUMMARIES_VERSION:
+                return table
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to read persona summaries {self.persona_summaries_path}: {e}")
+        return None
+    
+    def save_persona_summaries(self) -> None:
+        """Persist the persona summary table for the next process"""
+        tmp_path = self.persona_summaries_path.with_name(f"{self.persona_summaries_path.name}.{os.getpid()}.tmp")
+        try:
+            self.persona_summaries_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.persona_summaries, f)
+            os.replace(tmp_path, self.persona_summaries_path)
+        except OSError as e:
+            logger.warning(f"Failed to save persona summaries {self.persona_summaries_path}: {e}")
+    
+    def close(self) -> None:
+        """Stop the YAML parsing worker processes, if any were started"""
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction statistics of the parsed persona and asset caches"""
+        return {
+            "persona_cache": self.persona_cache.get_stats(),
+            "asset_cache": self.asset_cache.get_stats()
+        }
+    
     def get_persona_summary(self, persona_identifier: str) -> Dict[str, Any]:
         """Get a summary of a persona and its loaded assets"""
         loaded_assets = self.load_assets_for_persona(persona_identifier)
@@ -299,14 +845,19 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Persona-Driven Asset Loader v2")
-    parser.add_argument("--persona", required=True, help="Persona ID or base name")
+    parser.add_argument("--persona", help="Persona ID or base name (not needed for --list)")
     parser.add_argument("--list", action="store_true", help="List all available personas")
     parser.add_argument("--summary", action="store_true", help="Show persona summary")
     parser.add_argument("--load", action="store_true", help="Load persona assets")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes for parsing YAML files (0 = one per CPU)")
     
     args = parser.parse_args()
+    if not args.list and not args.persona:
+        parser.error("--persona is required unless --list is given")
     
-    loader = PersonaLoaderV2()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    loader = PersonaLoaderV2(jobs=jobs)
     
     if args.list:
         personas = loader.list_all_personas()
@@ -334,6 +885,8 @@ def main():
             print(f"Total size: {loaded_assets['total_size']} bytes")
         else:
             print(f"Failed to load persona: {args.persona}")
+    
+    loader.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
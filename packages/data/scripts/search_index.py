@@ -0,0 +1,285 @@
+"""
+Search Index for kOS
+Trigram and term inverted indexes over asset name, description, tags and path,
+plus the exact path lookup table
+
+Built by asset_indexer.py next to bootstrap.json and queried by AgentBootstrap.
+A query is answered by intersecting the postings of its trigrams and then
+confirming each candidate with the same case-insensitive substring test as
+AgentBootstrap.matches_search_query, against lowercased field text kept in the
+index, so no chunk has to be loaded to decide whether an asset matches.
+
+Ranked search uses word-level term postings with per-field term frequencies and
+scores documents with BM25F: field frequencies are boosted (name > tags >
+description > path) and length-normalized before BM25 saturation.
+
+The path table maps each file path to (asset_type, chunk, record_index) so a
+path resolves with one dictionary lookup and one record decode.
+"""
+
+import heapq
+import marshal
+import math
+import re
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+from index_format import write_sections, read_toc, section_bytes, Buffer
+
+SEARCH_INDEX_FILE = "search.kidx"
+PATH_INDEX_FILE = "paths.kidx"
+
+# BM25F field order in term postings and length tables: name, tags, description, path
+FIELD_BOOSTS = (3.0, 2.0, 1.0, 0.5)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Doc tuple layout: (asset_type, chunk, category, record_index, name, description, tags, path)
+DOC_ASSET_TYPE, DOC_CHUNK, DOC_CATEGORY, DOC_RECORD = 0, 1, 2, 3
+DOC_NAME, DOC_DESCRIPTION, DOC_TAGS, DOC_PATH = 4, 5, 6, 7
+
+
+def searchable_fields(file_data: Dict[str, Any]) -> Tuple[str, str, Tuple[str, ...], str]:
+    """Lowercased name, description, tags and path of a file record"""
+    def text(value: Any) -> str:
+        return value.lower() if isinstance(value, str) else ""
+
+    # Iterate tags the way the linear scan does: list items, dict keys or string characters
+    tags = file_data.get('tags', [])
+    if not isinstance(tags, (list, tuple, dict, str)):
+        tags = []
+    return (
+        text(file_data.get('name', '')),
+        text(file_data.get('description', '')),
+        tuple(tag.lower() for tag in tags if isinstance(tag, str)),
+        text(file_data.get('path', ''))
+    )
+
+
+def record_tags(file_data: Dict[str, Any]) -> List[str]:
+    """Lowercased tags of a file record for tag filtering: list items, or primary/secondary of a tag mapping"""
+    tags = file_data.get('tags')
+    if isinstance(tags, dict):
+        secondary = tags.get('secondary', [])
+        tags = [tags.get('primary'), *(secondary if isinstance(secondary, (list, tuple)) else [secondary])]
+    elif isinstance(tags, str):
+        tags = [tags]
+    elif not isinstance(tags, (list, tuple)):
+        return []
+    return list(dict.fromkeys(tag.lower() for tag in tags if isinstance(tag, str)))
+
+
+def trigrams(text: str) -> Set[str]:
+    """All three-character substrings of a string"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split lowercased text into alphanumeric word tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def doc_matches(doc: Tuple, query_lower: str) -> bool:
+    """Substring test equivalent to AgentBootstrap.matches_search_query"""
+    return (
+        query_lower in doc[DOC_NAME]
+        or query_lower in doc[DOC_DESCRIPTION]
+        or any(query_lower in tag for tag in doc[DOC_TAGS])
+        or query_lower in doc[DOC_PATH]
+    )
+
+
+def build_search_sections(records: Iterable[Tuple[str, str, str, int, Dict[str, Any]]],
+                          generation: str) -> Dict[str, Any]:
+    """Build the search index sections from (asset_type, chunk, category, record_index, file_data) rows"""
+    docs = []
+    postings: Dict[str, List[int]] = {}
+    terms: Dict[str, List[Tuple[int, int, int, int, int]]] = {}
+    lengths = []
+
+    for asset_type, chunk_name, category, record_index, file_data in records:
+        doc_id = len(docs)
+        name, description, tags, file_path = searchable_fields(file_data)
+        docs.append((asset_type, chunk_name, category, record_index, name, description, tags, file_path))
+
+        grams = trigrams(name) | trigrams(description) | trigrams(file_path)
+        for tag in tags:
+            grams |= trigrams(tag)
+        for gram in grams:
+            postings.setdefault(gram, []).append(doc_id)
+
+        # Term frequencies per field, in FIELD_BOOSTS order. The tags field holds the tag values
+        # (record_tags), not the substring test's view, which for a tag mapping is its keys
+        field_tokens = (
+            tokenize(name),
+            [token for tag in record_tags(file_data) for token in tokenize(tag)],
+            tokenize(description),
+            tokenize(file_path)
+        )
+        lengths.append(tuple(len(tokens) for tokens in field_tokens))
+        frequencies: Dict[str, List[int]] = {}
+        for field, tokens in enumerate(field_tokens):
+            for token in tokens:
+                frequencies.setdefault(token, [0, 0, 0, 0])[field] += 1
+        for token, tf in frequencies.items():
+            terms.setdefault(token, []).append((doc_id, *tf))
+
+    return {
+        "meta": {"generation": generation, "documents": len(docs)},
+        "docs": docs,
+        "postings": {gram: tuple(doc_ids) for gram, doc_ids in postings.items()},
+        "terms": {token: tuple(entries) for token, entries in terms.items()},
+        "lengths": lengths
+    }
+
+
+def write_search_index(path: Path, records: Iterable[Tuple[str, str, str, int, Dict[str, Any]]],
+                       generation: str) -> int:
+    """Build and write the search index, returning the number of documents"""
+    sections = build_search_sections(records, generation)
+    write_sections(path, sections)
+    return sections["meta"]["documents"]
+
+
+def write_path_index(path: Path, records: Iterable[Tuple[str, str, str, int, Dict[str, Any]]],
+                     generation: str) -> int:
+    """Write the path -> (asset_type, chunk, record_index) table, returning the number of paths"""
+    paths: Dict[str, Tuple[str, str, int]] = {}
+    for asset_type, chunk_name, _category, record_index, file_data in records:
+        # The first record for a path wins, as in a scan over the bootstrap order
+        paths.setdefault(file_data.get('path', ''), (asset_type, chunk_name, record_index))
+
+    write_sections(path, {"meta": {"generation": generation}, "paths": paths})
+    return len(paths)
+
+
+def load_path_index(path: Path) -> Tuple[str, Dict[str, Tuple[str, str, int]]]:
+    """Load the generation and path table written by write_path_index"""
+    with open(path, 'rb') as f:
+        return parse_path_index(f.read())
+
+
+def parse_path_index(buffer: Buffer) -> Tuple[str, Dict[str, Tuple[str, str, int]]]:
+    """Decode the generation and path table from an in-memory path index"""
+    toc, payload_start = read_toc(buffer)
+    meta = marshal.loads(section_bytes(buffer, toc, payload_start, "meta"))
+    return meta["generation"], marshal.loads(section_bytes(buffer, toc, payload_start, "paths"))
+
+
+class SearchIndex:
+    def __init__(self, sections: Dict[str, Any]):
+        self.generation = sections["meta"]["generation"]
+        self.docs = sections["docs"]
+        self.postings = sections["postings"]
+        self.terms = sections["terms"]
+        self.lengths = sections["lengths"]
+
+        # Average field lengths for BM25 length normalization
+        count = max(1, len(self.lengths))
+        self.average_lengths = tuple(
+            sum(doc_lengths[field] for doc_lengths in self.lengths) / count
+            for field in range(len(FIELD_BOOSTS))
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "SearchIndex":
+        """Load a search index written by write_search_index"""
+        with open(path, 'rb') as f:
+            return cls.from_buffer(f.read())
+
+    @classmethod
+    def from_buffer(cls, buffer: Buffer) -> "SearchIndex":
+        """Decode a search index from an in-memory copy of the file"""
+        toc, payload_start = read_toc(buffer)
+
+        return cls({
+            name: marshal.loads(section_bytes(buffer, toc, payload_start, name))
+            for name in ("meta", "docs", "postings", "terms", "lengths")
+        })
+
+    @classmethod
+    def build(cls, records: Iterable[Tuple[str, str, str, int, Dict[str, Any]]], generation: str = "") -> "SearchIndex":
+        """Build an in-memory search index without writing it"""
+        return cls(build_search_sections(records, generation))
+
+    def candidates(self, query_lower: str) -> Optional[List[int]]:
+        """Doc ids that contain every trigram of the query, or None when the query is too short"""
+        grams = trigrams(query_lower)
+        if not grams:
+            return None
+
+        postings = []
+        for gram in grams:
+            doc_ids = self.postings.get(gram)
+            if not doc_ids:
+                return []
+            postings.append(doc_ids)
+
+        # Intersect from the rarest trigram outwards
+        postings.sort(key=len)
+        matched = set(postings[0])
+        for doc_ids in postings[1:]:
+            matched.intersection_update(doc_ids)
+            if not matched:
+                break
+        return sorted(matched)
+
+    def search(self, query: str, asset_types: List[str] = None, categories: List[str] = None) -> List[Tuple]:
+        """Matching docs ordered by asset type (as given), then index order"""
+        query_lower = query.lower()
+        doc_ids = self.candidates(query_lower)
+        if doc_ids is None:
+            doc_ids = range(len(self.docs))
+
+        matches = []
+        for doc_id in doc_ids:
+            doc = self.docs[doc_id]
+            if asset_types is not None and doc[DOC_ASSET_TYPE] not in asset_types:
+                continue
+            if categories and doc[DOC_CATEGORY] not in categories:
+                continue
+            if doc_matches(doc, query_lower):
+                matches.append(doc)
+
+        if asset_types is not None:
+            type_order = {asset_type: i for i, asset_type in reversed(list(enumerate(asset_types)))}
+            matches.sort(key=lambda doc: type_order[doc[DOC_ASSET_TYPE]])
+        return matches
+
+    def rank(self, query: str, asset_types: List[str] = None, categories: List[str] = None,
+             limit: int = 10, offset: int = 0) -> Tuple[int, List[Tuple[float, Tuple]]]:
+        """BM25F-rank docs for a query; returns (total matches, [(score, doc)]) for the requested page"""
+        scores: Dict[int, float] = {}
+        document_count = len(self.docs)
+
+        for token in set(tokenize(query)):
+            entries = self.terms.get(token)
+            if not entries:
+                continue
+
+            idf = math.log(1 + (document_count - len(entries) + 0.5) / (len(entries) + 0.5))
+            for doc_id, *frequencies in entries:
+                doc_lengths = self.lengths[doc_id]
+                weighted = 0.0
+                for field, tf in enumerate(frequencies):
+                    if tf:
+                        average = self.average_lengths[field] or 1.0
+                        norm = 1 - BM25_B + BM25_B * doc_lengths[field] / average
+                        weighted += FIELD_BOOSTS[field] * tf / norm
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * weighted * (BM25_K1 + 1) / (weighted + BM25_K1)
+
+        candidates = []
+        for doc_id, score in scores.items():
+            doc = self.docs[doc_id]
+            if asset_types is not None and doc[DOC_ASSET_TYPE] not in asset_types:
+                continue
+            if categories and doc[DOC_CATEGORY] not in categories:
+                continue
+            candidates.append((score, -doc_id))
+
+        # Only the top offset + limit entries are ordered; ties go to the earlier document
+        top = heapq.nlargest(offset + limit, candidates)
+        page = [(score, self.docs[-neg_doc_id]) for score, neg_doc_id in top[offset:]]
+        return len(candidates), page
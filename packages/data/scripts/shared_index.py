@@ -0,0 +1,196 @@
+"""
+Shared-Memory Index for kOS
+Serves one in-memory copy of the index files to every agent process on a host
+
+An index host packs bootstrap.json, the search and path indexes and every
+chunk listed in the bootstrap into a single named shared-memory segment,
+laid out as a .kidx container with one raw section per index file. Agent
+processes attach to the segment by name and read those sections in place:
+binary chunks with a record table are decoded per record straight out of
+shared memory, so attaching costs a mapping instead of parsing the index.
+
+The host republishes the segment when bootstrap.json changes. Processes that
+are already attached keep reading the snapshot they attached to; new
+AgentBootstrap instances see the new one. Segment names are predictable, so
+agents only attach to a segment owned by their own user.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import signal
+import sys
+import time
+from multiprocessing import shared_memory, resource_tracker
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from index_format import dumps_sections, read_toc, section_bytes, BINARY_SUFFIX
+from search_index import SEARCH_INDEX_FILE, PATH_INDEX_FILE
+
+logger = logging.getLogger(__name__)
+
+
+def segment_name(indexes_path: Path) -> str:
+    """Shared-memory segment name for an indexes directory"""
+    digest = hashlib.sha1(str(Path(indexes_path).resolve()).encode('utf-8')).hexdigest()[:12]
+    return f"kos_index_{digest}"
+
+
+def pack_index_files(indexes_path: Path) -> Tuple[bytes, str]:
+    """Pack the current index files into one buffer, returning it with the bootstrap generation"""
+    bootstrap_bytes = (indexes_path / "bootstrap.json").read_bytes()
+    bootstrap_data = json.loads(bootstrap_bytes)
+
+    files: Dict[str, bytes] = {"bootstrap.json": bootstrap_bytes}
+    for name in (SEARCH_INDEX_FILE, PATH_INDEX_FILE):
+        path = indexes_path / name
+        if path.exists():
+            files[name] = path.read_bytes()
+
+    for asset_type, type_info in bootstrap_data.get('indexes', {}).items():
+        for chunk_name in type_info.get('chunks', []):
+            chunk_path = indexes_path / asset_type / f"{chunk_name}.json"
+            binary_chunk_path = indexes_path / asset_type / f"{chunk_name}{BINARY_SUFFIX}"
+
+            # Same freshness rule as AgentBootstrap.load_chunk: binary unless the JSON is newer
+            if binary_chunk_path.exists() and (
+                    not chunk_path.exists()
+                    or chunk_path.stat().st_mtime_ns <= binary_chunk_path.stat().st_mtime_ns):
+                files[f"{asset_type}/{chunk_name}{BINARY_SUFFIX}"] = binary_chunk_path.read_bytes()
+            elif chunk_path.exists():
+                files[f"{asset_type}/{chunk_name}.json"] = chunk_path.read_bytes()
+
+    return dumps_sections(files), bootstrap_data.get('lastUpdated', '')
+
+
+class SharedIndexHost:
+    def __init__(self, indexes_path: Path, poll_interval: float = 2.0):
+        self.indexes_path = Path(indexes_path)
+        self.name = segment_name(self.indexes_path)
+        self.poll_interval = poll_interval
+        self.segment: Optional[shared_memory.SharedMemory] = None
+        self.bootstrap_mtime = None
+
+    def publish(self) -> bool:
+        """Pack the index into a fresh shared-memory segment under the host's name"""
+        bootstrap_path = self.indexes_path / "bootstrap.json"
+        try:
+            mtime = bootstrap_path.stat().st_mtime_ns
+            payload, generation = pack_index_files(self.indexes_path)
+        except Exception as e:
+            logger.error(f"Failed to pack index from {self.indexes_path}: {e}")
+            return False
+
+        # Unlink the previous snapshot; attached processes keep their mapping until they exit
+        self.unlink()
+        try:
+            stale = shared_memory.SharedMemory(name=self.name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+
+        segment = shared_memory.SharedMemory(name=self.name, create=True, size=len(payload))
+        segment.buf[:len(payload)] = payload
+        self.segment = segment
+        self.bootstrap_mtime = mtime
+
+        logger.info(f"📡 Published index {generation} as {self.name} ({len(payload)} bytes)")
+        return True
+
+    def refresh(self) -> bool:
+        """Republish when bootstrap.json changed since the last publish"""
+        try:
+            mtime = (self.indexes_path / "bootstrap.json").stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self.bootstrap_mtime:
+            return False
+        return self.publish()
+
+    def serve_forever(self) -> None:
+        """Publish the index and keep it current until interrupted"""
+        self.publish()
+        logger.info("🚀 Index host running. Press Ctrl+C to stop.")
+
+        # Unlink the segment on SIGTERM too, not only on Ctrl+C
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            while True:
+                time.sleep(self.poll_interval)
+                self.refresh()
+        except KeyboardInterrupt:
+            logger.info("🛑 Index host stopped")
+        finally:
+            self.unlink()
+
+    def unlink(self) -> None:
+        """Remove the published segment"""
+        if self.segment is not None:
+            self.segment.close()
+            self.segment.unlink()
+            self.segment = None
+
+
+class AttachedSegment(shared_memory.SharedMemory):
+    """Attached segment that stays mapped while views into it are alive, instead of failing to close"""
+
+    def __del__(self):
+        try:
+            self.close()
+        except (BufferError, OSError):
+            # Views into the segment outlive it (e.g. cached lazy chunks at interpreter exit);
+            # the mapping is released with the last view, or by the OS when the process exits
+            pass
+
+
+class SharedIndex:
+    def __init__(self, segment: shared_memory.SharedMemory):
+        self.segment = segment
+        self.buffer = segment.buf
+        self.toc, self.payload_start = read_toc(self.buffer)
+
+    @classmethod
+    def attach(cls, indexes_path: Path) -> Optional["SharedIndex"]:
+        """Attach to the segment published for an indexes directory, if a host is running"""
+        name = segment_name(indexes_path)
+        try:
+            try:
+                segment = AttachedSegment(name=name, track=False)
+            except TypeError:
+                # Before Python 3.13 attaching registers the segment for unlinking at exit
+                segment = AttachedSegment(name=name)
+                resource_tracker.unregister(segment._name, "shared_memory")
+        except FileNotFoundError:
+            return None
+
+        # Another user could publish under the same name; its contents are unmarshalled, so refuse it
+        fd = getattr(segment, "_fd", -1)
+        owner = os.fstat(fd).st_uid if fd >= 0 else os.getuid()
+        if owner != os.getuid():
+            logger.warning(f"Shared index {name} belongs to uid {owner}, not this user; ignoring it")
+            segment.close()
+            return None
+        return cls(segment)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.toc
+
+    def get(self, name: str) -> Optional[memoryview]:
+        """Zero-copy view of a packed index file, or None if it was not packed"""
+        if name not in self.toc:
+            return None
+        return section_bytes(self.buffer, self.toc, self.payload_start, name)
+
+    def close(self) -> None:
+        """Unmap the segment once nothing references the views handed out by get()"""
+        if self.segment is None:
+            return
+        segment, self.segment = self.segment, None
+        self.buffer = None
+        try:
+            segment.close()
+        except BufferError:
+            logger.debug("Shared index views still in use; the segment stays mapped until they are released")
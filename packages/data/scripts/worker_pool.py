@@ -0,0 +1,54 @@
+"""
+Worker Pool for kOS
+Process pool for order-preserving parallel maps, started on first use and reused
+
+Shared by AssetIndexer (metadata extraction) and PersonaLoaderV2 (YAML parsing).
+A long-lived owner keeps one pool for its lifetime, so later batches don't pay
+for starting worker processes again.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+
+class WorkerPool:
+    """At most `workers` processes, started by the first map() and kept until close()"""
+
+    def __init__(self, workers: int, initializer: Optional[Callable[..., None]] = None, initargs: Iterable[Any] = ()):
+        self.workers = max(1, workers)
+        self.initializer = initializer
+        self.initargs = tuple(initargs)
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def map(self, function: Callable[[Any], Any], items: Sequence[Any]) -> List[Any]:
+        """function(item) for every item, computed in the workers and returned in input order"""
+        if not items:
+            return []
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=self.initializer, initargs=self.initargs
+            )
+
+        # Hand each worker a few batches so slow items don't stall a single process
+        workers = min(self.workers, len(items))
+        chunksize = max(1, math.ceil(len(items) / (workers * 4)))
+        try:
+            return list(self.executor.map(function, items, chunksize=chunksize))
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next map
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None